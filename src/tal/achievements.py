@@ -2,12 +2,18 @@
 
 from __future__ import annotations
 
+import atexit
+import bisect
 import json
 import os
+import shutil
+import threading
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Literal
 
+from tal.storage.io import dumps_json, write_json
+
 Mode = Literal["paper", "real"]
 
 
@@ -39,41 +45,141 @@ def _ensure_dirs() -> None:
     _badges_dir().mkdir(parents=True, exist_ok=True)
 
 
-def _load_state() -> dict[str, Any]:
+_STATE_CACHE: tuple[str, int, int, dict[str, Any]] | None = None
+
+# State writes are coalesced: ``_save_state`` stages the state in memory and a
+# flush happens after a short idle period, after a burst of writes, or at exit.
+_FLUSH_DELAY_SECONDS = 0.1
+_FLUSH_MAX_PENDING = 16
+_PENDING_STATE: tuple[Path, dict[str, Any]] | None = None
+_PENDING_WRITES = 0
+_FLUSH_TIMER: threading.Timer | None = None
+_STATE_LOCK = threading.RLock()
+
+
+def _empty_state() -> dict[str, Any]:
+    return {"achievements": {}}
+
+
+def _copy_state(state: dict[str, Any]) -> dict[str, Any]:
+    return {**state, "achievements": dict(state["achievements"])}
+
+
+def _read_state() -> dict[str, Any]:
+    """Return the parsed state, reusing the cached copy while the file is unchanged.
+
+    The returned dict is shared with the cache and must not be mutated.
+    """
+
+    global _STATE_CACHE
     path = _state_path()
-    if not path.exists():
-        return {"achievements": {}}
+    pending = _PENDING_STATE
+    if pending is not None and pending[0] == path:
+        return pending[1]
+    try:
+        stat = path.stat()
+    except OSError:
+        _STATE_CACHE = None
+        return _empty_state()
+    cache_key = (str(path), stat.st_mtime_ns, stat.st_size)
+    if _STATE_CACHE is not None and _STATE_CACHE[:3] == cache_key:
+        return _STATE_CACHE[3]
     try:
         data = json.loads(path.read_text())
     except (OSError, json.JSONDecodeError):
-        return {"achievements": {}}
+        return _empty_state()
     if not isinstance(data, dict):
-        return {"achievements": {}}
+        return _empty_state()
     data.setdefault("achievements", {})
     achievements = data["achievements"]
     if not isinstance(achievements, dict):
         data["achievements"] = {}
+    _STATE_CACHE = (*cache_key, data)
     return data
 
 
+def _load_state() -> dict[str, Any]:
+    return _copy_state(_read_state())
+
+
+def _flush_state_locked() -> None:
+    global _STATE_CACHE, _PENDING_STATE, _PENDING_WRITES, _FLUSH_TIMER
+    if _FLUSH_TIMER is not None:
+        _FLUSH_TIMER.cancel()
+        _FLUSH_TIMER = None
+    pending = _PENDING_STATE
+    _PENDING_STATE = None
+    _PENDING_WRITES = 0
+    if pending is None:
+        return
+    path, state = pending
+    # Write then rename so a crash never leaves a truncated state.json behind.
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    try:
+        _ensure_dirs()
+        # The staged path may predate a change of ACHIEVEMENTS_DIR.
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_json(tmp_path, state, sort_keys=True)
+        os.replace(tmp_path, path)
+    except OSError:
+        # Re-stage the state (unless a newer one was staged meanwhile) so the next
+        # save or the atexit flush writes it instead of it being lost.
+        if _PENDING_STATE is None:
+            _PENDING_STATE = pending
+        raise
+    stat = path.stat()
+    _STATE_CACHE = (str(path), stat.st_mtime_ns, stat.st_size, state)
+
+
+def _flush_from_timer() -> None:
+    with _STATE_LOCK:
+        try:
+            _flush_state_locked()
+        except OSError:
+            # Best-effort: the state stays staged for the next save or force_flush.
+            pass
+
+
+def force_flush() -> None:
+    """Write any pending achievements state to disk immediately."""
+
+    with _STATE_LOCK:
+        _flush_state_locked()
+
+
 def _save_state(state: dict[str, Any]) -> None:
-    _ensure_dirs()
+    global _PENDING_STATE, _PENDING_WRITES, _FLUSH_TIMER
     path = _state_path()
-    path.write_text(json.dumps(state, indent=2, sort_keys=True))
+    with _STATE_LOCK:
+        if _PENDING_STATE is not None and _PENDING_STATE[0] != path:
+            _flush_state_locked()
+        _PENDING_STATE = (path, _copy_state(state))
+        _PENDING_WRITES += 1
+        if _PENDING_WRITES >= _FLUSH_MAX_PENDING:
+            _flush_state_locked()
+            return
+        if _FLUSH_TIMER is not None:
+            _FLUSH_TIMER.cancel()
+        _FLUSH_TIMER = threading.Timer(_FLUSH_DELAY_SECONDS, _flush_from_timer)
+        _FLUSH_TIMER.daemon = True
+        _FLUSH_TIMER.start()
 
 
-def _append_log(entry: dict[str, Any]) -> None:
-    _ensure_dirs()
-    log_path = _log_path()
-    with log_path.open("a", encoding="utf-8") as handle:
-        handle.write(json.dumps(entry, sort_keys=True))
-        handle.write("\n")
+atexit.register(force_flush)
+
+
+def _append_log(entries: list[dict[str, Any]]) -> None:
+    # One append per batch; the file is reopened each time so a log that was
+    # deleted or rotated externally is recreated rather than written to an
+    # unlinked inode.
+    payload = b"".join(dumps_json(entry, indent=False, sort_keys=True) + b"\n" for entry in entries)
+    with _STATE_LOCK, _log_path().open("ab") as handle:
+        handle.write(payload)
 
 
 def _write_badge(entry: dict[str, Any]) -> None:
-    _ensure_dirs()
     badge_path = _badges_dir() / f"{entry['key']}.json"
-    badge_path.write_text(json.dumps(entry, indent=2, sort_keys=True))
+    write_json(badge_path, entry, sort_keys=True)
 
 
 def _fmt_threshold(value: float) -> str:
@@ -89,28 +195,48 @@ def _achievement_key(kind: str, threshold: float, mode: Mode) -> str:
     return f"{mode}_first_${pretty}_profit"
 
 
-def _record(kind: str, threshold: float, *, mode: Mode, meta: dict[str, Any]) -> str | None:
-    state = _load_state()
-    achievements = state.setdefault("achievements", {})
-    key = _achievement_key(kind, threshold, mode)
-    if key in achievements:
-        return None
-    ts = datetime.now(timezone.utc).isoformat()
-    entry = {"key": key, "ts": ts, "meta": meta}
-    achievements[key] = entry
-    try:
-        _append_log(entry)
-        _write_badge(entry)
-        _save_state(state)
-    except OSError:
-        # Best-effort: on filesystem issues, drop unlock and keep state consistent.
-        achievements.pop(key, None)
-        return None
-    return key
+def _record_many(
+    entries: list[tuple[str, float, dict[str, Any]]], mode: Mode
+) -> list[str]:
+    """Unlock every new achievement in ``entries`` with a single state write."""
+
+    if not entries:
+        return []
+    # Concurrent callers (e.g. parallel league steps) must not interleave the
+    # read-modify-write of the shared state.
+    with _STATE_LOCK:
+        state = _load_state()
+        achievements = state.setdefault("achievements", {})
+        ts = datetime.now(timezone.utc).isoformat()
+        new_entries: list[dict[str, Any]] = []
+        for kind, threshold, meta in entries:
+            key = _achievement_key(kind, threshold, mode)
+            if key in achievements:
+                continue
+            entry = {"key": key, "ts": ts, "meta": meta}
+            achievements[key] = entry
+            new_entries.append(entry)
+        if not new_entries:
+            return []
+        try:
+            _ensure_dirs()
+            _append_log(new_entries)
+            for entry in new_entries:
+                _write_badge(entry)
+            _save_state(state)
+        except OSError:
+            # Best-effort: on filesystem issues, drop unlocks and keep state consistent.
+            for entry in new_entries:
+                achievements.pop(entry["key"], None)
+            return []
+        return [entry["key"] for entry in new_entries]
 
 
 _NOTIONAL_THRESHOLDS = [1, 10, 69, 100, 420, 1000]
 _PROFIT_THRESHOLDS = [1, 10, 69, 100, 420, 1000]
+# Thresholds are kept sorted so the crossed ones are always a prefix.
+_MIN_NOTIONAL = _NOTIONAL_THRESHOLDS[0]
+_MIN_PROFIT = _PROFIT_THRESHOLDS[0]
 
 
 def get_thresholds() -> dict[str, list[float]]:
@@ -131,13 +257,13 @@ def record_trade_notional(notional: float, mode: Mode) -> list[str]:
         value = abs(float(notional))
     except (TypeError, ValueError):
         return []
-    unlocked: list[str] = []
-    for threshold in _NOTIONAL_THRESHOLDS:
-        if value >= threshold:
-            key = _record("trade", threshold, mode=mode, meta={"notional": value})
-            if key:
-                unlocked.append(key)
-    return unlocked
+    if not value >= _MIN_NOTIONAL:  # also rejects NaN
+        return []
+    crossed = _NOTIONAL_THRESHOLDS[: bisect.bisect_right(_NOTIONAL_THRESHOLDS, value)]
+    return _record_many(
+        [("trade", threshold, {"notional": value}) for threshold in crossed],
+        mode,
+    )
 
 
 def record_profit_dollars(pnl_dollars: float, mode: Mode) -> list[str]:
@@ -149,15 +275,13 @@ def record_profit_dollars(pnl_dollars: float, mode: Mode) -> list[str]:
         value = float(pnl_dollars)
     except (TypeError, ValueError):
         return []
-    if value <= 0:
+    if value <= 0 or not value >= _MIN_PROFIT:
         return []
-    unlocked: list[str] = []
-    for threshold in _PROFIT_THRESHOLDS:
-        if value >= threshold:
-            key = _record("profit", threshold, mode=mode, meta={"profit": value})
-            if key:
-                unlocked.append(key)
-    return unlocked
+    crossed = _PROFIT_THRESHOLDS[: bisect.bisect_right(_PROFIT_THRESHOLDS, value)]
+    return _record_many(
+        [("profit", threshold, {"profit": value}) for threshold in crossed],
+        mode,
+    )
 
 
 def list_achievements() -> dict[str, Any]:
@@ -169,16 +293,21 @@ def list_achievements() -> dict[str, Any]:
 def is_unlocked(key: str) -> bool:
     """Check if a badge key has already been unlocked."""
 
-    state = _load_state()
-    achievements = state.get("achievements", {})
-    if not isinstance(achievements, dict):
-        return False
-    return key in achievements
+    return key in _read_state()["achievements"]
+
+
+def unlocked_keys() -> set[str]:
+    """Return the set of unlocked badge keys from a single state read."""
+
+    return set(_read_state()["achievements"])
 
 
 def reset_achievements() -> None:
     """Wipe all tracked achievements and artifacts."""
 
+    global _STATE_CACHE
+    force_flush()
+    _STATE_CACHE = None
     directory = _dir()
     state_path = _state_path()
     log_path = _log_path()
@@ -189,20 +318,13 @@ def reset_achievements() -> None:
         if log_path.exists():
             log_path.unlink()
         if badges_dir.exists():
-            for badge in badges_dir.glob("*.json"):
-                badge.unlink()
-            try:
-                badges_dir.rmdir()
-            except OSError:
-                pass
+            shutil.rmtree(badges_dir, ignore_errors=True)
     finally:
         if directory.exists() and not any(directory.iterdir()):
             directory.rmdir()
 
 
-def all_planned_badge_keys() -> list[str]:
-    """Return the canonical list of badge keys across modes."""
-
+def _build_planned_badge_keys() -> tuple[str, ...]:
     keys: list[str] = []
     for is_real in (False, True):
         mode: Mode = "real" if is_real else "paper"
@@ -210,15 +332,26 @@ def all_planned_badge_keys() -> list[str]:
             keys.append(_achievement_key("trade", threshold, mode))
         for threshold in _PROFIT_THRESHOLDS:
             keys.append(_achievement_key("profit", threshold, mode))
-    return keys
+    return tuple(keys)
+
+
+_ALL_PLANNED_KEYS = _build_planned_badge_keys()
+
+
+def all_planned_badge_keys() -> list[str]:
+    """Return the canonical list of badge keys across modes."""
+
+    return list(_ALL_PLANNED_KEYS)
 
 
 __all__ = [
     "all_planned_badge_keys",
+    "force_flush",
     "get_thresholds",
     "is_unlocked",
     "list_achievements",
     "record_profit_dollars",
     "record_trade_notional",
     "reset_achievements",
+    "unlocked_keys",
 ]
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import re
+from functools import lru_cache
 from pathlib import Path
 from typing import Literal, cast
 from urllib.parse import quote
@@ -14,6 +16,11 @@ LabelCase = Literal["lower", "title"]
 MARKER_START = "<!-- ACHIEVEMENTS:START -->"
 MARKER_END = "<!-- ACHIEVEMENTS:END -->"
 
+_SHIELDS_BADGE_PREFIX = "https://img.shields.io/badge/"
+_BADGE_KEY_RE = re.compile(
+    r"(?P<mode>paper|real)_first_\$(?P<threshold>[^_]+)_(?P<kind>trade|profit)"
+)
+
 
 class BadgeKeyError(ValueError):
     """Raised when an unexpected badge key format is encountered."""
@@ -22,15 +29,10 @@ class BadgeKeyError(ValueError):
 def _parse_badge_key(key: str) -> tuple[str, str, str]:
     """Return mode, threshold, and kind parsed from a badge key."""
 
-    delimiter = "_first_$"
-    if delimiter not in key:
+    match = _BADGE_KEY_RE.fullmatch(key)
+    if match is None:
         raise BadgeKeyError(f"Invalid badge key: {key}")
-    mode, remainder = key.split(delimiter, 1)
-    try:
-        threshold, kind = remainder.rsplit("_", 1)
-    except ValueError as exc:  # pragma: no cover - defensive guard
-        raise BadgeKeyError(f"Invalid badge key: {key}") from exc
-    return mode, threshold, kind
+    return match.group("mode"), match.group("threshold"), match.group("kind")
 
 
 def _apply_label_case(label: str, label_case: LabelCase) -> str:
@@ -53,17 +55,17 @@ def _build_label(mode: str, threshold: str, kind: str, label_case: LabelCase) ->
     return _apply_label_case(label, label_case)
 
 
-def _badge_markdown(key: str, *, style: Style, label_case: LabelCase) -> str:
+@lru_cache(maxsize=256)
+def _badge_url(label: str, status: str, color: str, style: str) -> str:
+    return f"{_SHIELDS_BADGE_PREFIX}{quote(label, safe='')}-{status}-{color}?style={style}"
+
+
+def _badge_markdown(key: str, *, unlocked: bool, style: Style, label_case: LabelCase) -> str:
     mode, threshold, kind = _parse_badge_key(key)
     label = _build_label(mode, threshold, kind, label_case)
-    unlocked = achievements.is_unlocked(key)
     status = "unlocked" if unlocked else "locked"
     color = "success" if unlocked else "lightgrey"
-    encoded_label = quote(label, safe="")
-    url = (
-        "https://img.shields.io/badge/"
-        f"{encoded_label}-{status}-{color}?style={style}"
-    )
+    url = _badge_url(label, status, color, style)
     alt_text = label.title() if label_case == "lower" else label
     return f"![{alt_text}]({url})"
 
@@ -72,8 +74,14 @@ def render_badges_line(*, style: Style = "flat-square", label_case: LabelCase =
     """Render all planned badges as a single Markdown line."""
 
     validated_style = _validate_style(style)
+    unlocked = achievements.unlocked_keys()
     badges = [
-        _badge_markdown(key, style=validated_style, label_case=label_case)
+        _badge_markdown(
+            key,
+            unlocked=key in unlocked,
+            style=validated_style,
+            label_case=label_case,
+        )
         for key in achievements.all_planned_badge_keys()
     ]
     return " ".join(badges)
@@ -86,11 +94,11 @@ def update_readme(path: Path | str, badges_line: str) -> bool:
     if not readme_path.exists():
         return False
     content = readme_path.read_text(encoding="utf-8")
-    if MARKER_START in content and MARKER_END in content:
-        prefix, remainder = content.split(MARKER_START, 1)
-        _, suffix = remainder.split(MARKER_END, 1)
+    start = content.find(MARKER_START)
+    end = content.find(MARKER_END, start) if start != -1 else -1
+    if end != -1:
         new_content = (
-            f"{prefix}{MARKER_START}\n{badges_line}\n{MARKER_END}{suffix}"
+            f"{content[:start]}{MARKER_START}\n{badges_line}\n{content[end:]}"
         )
     else:
         if content and not content.endswith("\n"):
@@ -1,12 +1,19 @@
 from __future__ import annotations
 
+import copy
+import functools
 import os
 import re
 from pathlib import Path
-from typing import Match
+from typing import Any, Match
 
 import yaml
 
+try:  # Prefer the LibYAML-backed loader when PyYAML was built with it.
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # pragma: no cover - pure-Python PyYAML build
+    from yaml import SafeLoader as _YamlLoader  # type: ignore[assignment]
+
 from .spec import AgentSpec
 
 _VAR = re.compile(r"\$\{([^}]+)\}")
@@ -27,9 +34,21 @@ def short_name_from(dotted_or_short: str) -> str:
     return dotted_or_short
 
 
+@functools.lru_cache(maxsize=64)
+def _parse_agent_text(expanded: str) -> Any:
+    """Parse expanded agent YAML; callers must copy before mutating the result."""
+
+    return yaml.load(expanded, Loader=_YamlLoader)
+
+
 def load_agent_config(path: str) -> AgentSpec:
     txt = Path(path).read_text()
-    raw = yaml.safe_load(_expand_env(txt)) or {}
+    raw = copy.deepcopy(_parse_agent_text(_expand_env(txt))) or {}
+    return agent_spec_from_mapping(raw)
+
+
+def agent_spec_from_mapping(raw: dict) -> AgentSpec:
+    """Validate an already-parsed agent config mapping (the dict is modified in place)."""
     if isinstance(raw, dict) and "agent" in raw:
         agent_meta = raw.pop("agent") or {}
         for key in ("id", "version", "capital"):
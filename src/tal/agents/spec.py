@@ -57,7 +57,7 @@ class MarketHours(BaseModel):
 
 class OrchestratorCfg(BaseModel):
     cycle_minutes: int = 5
-    market_hours: MarketHours = MarketHours()
+    market_hours: MarketHours = Field(default_factory=MarketHours.model_construct)
 
 
 class StorageCfg(BaseModel):
@@ -97,18 +97,22 @@ class AgentSpec(BaseModel):
     capital: float = 100.0
     universe: List[str] = ["SPY"]
     components: Components
-    data: DataCfg = DataCfg()
-    strategy: Dict = {
-        "params": {
-            "rsi_len": 14,
-            "oversold": 30,
-            "overbought": 70,
-            "size_pct": 10,
+    data: DataCfg = Field(default_factory=DataCfg.model_construct)
+    strategy: Dict = Field(
+        default_factory=lambda: {
+            "params": {
+                "rsi_len": 14,
+                "oversold": 30,
+                "overbought": 70,
+                "size_pct": 10,
+            }
         }
-    }
-    risk: RiskCfg = RiskCfg()
-    evaluation: EvalCfg = EvalCfg()
-    orchestrator: OrchestratorCfg = OrchestratorCfg()
-    storage: StorageCfg = StorageCfg()
-    live: LiveCfg = LiveCfg()
+    )
+    # Absent sections are filled with known-good defaults; model_construct skips
+    # re-validating them on every load.
+    risk: RiskCfg = Field(default_factory=RiskCfg.model_construct)
+    evaluation: EvalCfg = Field(default_factory=EvalCfg.model_construct)
+    orchestrator: OrchestratorCfg = Field(default_factory=OrchestratorCfg.model_construct)
+    storage: StorageCfg = Field(default_factory=StorageCfg.model_construct)
+    live: LiveCfg = Field(default_factory=LiveCfg.model_construct)
     metadata: Optional[AgentMetadata] = None
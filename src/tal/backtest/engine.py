@@ -1,21 +1,38 @@
 from __future__ import annotations
 
+import copy
+import functools
 import hashlib
-import json
 import math
 import os
+import re
 import subprocess
 import uuid
-from datetime import datetime, timezone
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any, cast
 
+import numpy as np
 import pandas as pd
 import yfinance as yf
 import yaml
 
+try:  # Prefer the LibYAML-backed loader/dumper when PyYAML was built with it.
+    from yaml import CSafeDumper as _YamlDumper
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # pragma: no cover - pure-Python PyYAML build
+    from yaml import SafeDumper as _YamlDumper  # type: ignore[assignment]
+    from yaml import SafeLoader as _YamlLoader  # type: ignore[assignment]
+
+try:  # Optional JIT for the equity curve loop; NumPy is used otherwise.
+    from numba import njit
+except ImportError:  # pragma: no cover - numba is an optional extra
+    njit = None  # type: ignore[assignment, unused-ignore]
+
 from tal.evaluation.metrics import compute_kpis
 from tal.storage.db import get_engine, record_run
+from tal.storage.io import write_json
 from tal.strategies.rsi_mean_rev import RSIMeanReversion
 
 DEFAULT_ENV = {
@@ -27,35 +44,135 @@ DEFAULT_ENV = {
 }
 
 
-def _load_env(env_file: str | None = None) -> None:
-    env_candidate = env_file if env_file is not None else os.environ.get("TAL_ENV_FILE")
-    if env_candidate is None:
-        env_candidate = ".env"
-    env_path = Path(env_candidate)
-    if env_path.exists():
-        for line in env_path.read_text().splitlines():
+# Parsed .env files keyed by resolved path, with the mtime they were read at.
+_ENV_CACHE: dict[str, tuple[int, dict[str, str]]] = {}
+
+
+def _read_env_file(env_path: Path) -> dict[str, str] | None:
+    try:
+        mtime_ns = env_path.stat().st_mtime_ns
+    except OSError:
+        return None
+    cache_key = str(env_path.resolve())
+    cached = _ENV_CACHE.get(cache_key)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+    values: dict[str, str] = {}
+    with env_path.open("r", encoding="utf-8") as f:
+        for line in f:
             line = line.strip()
             if not line or line.startswith("#") or "=" not in line:
                 continue
             key, value = line.split("=", 1)
-            os.environ.setdefault(key.strip(), value.strip())
+            values.setdefault(key.strip(), value.strip())
+    _ENV_CACHE[cache_key] = (mtime_ns, values)
+    return values
+
+
+def _load_env(env_file: str | None = None) -> None:
+    env_candidate = env_file if env_file is not None else os.environ.get("TAL_ENV_FILE")
+    if env_candidate is None:
+        env_candidate = ".env"
+    values = _read_env_file(Path(env_candidate))
+    if values:
+        for key, value in values.items():
+            os.environ.setdefault(key, value)
     for key, value in DEFAULT_ENV.items():
         os.environ.setdefault(key, value)
 
 
-def _load_data(symbol: str, lookback_bars: int, tf: str) -> pd.DataFrame:
-    df = yf.download(symbol, period="max", interval="1d", auto_adjust=True)  # simple daily
+def _data_cache_dir() -> Path:
+    return Path(os.getenv("TAL_DATA_CACHE", "./artifacts/.ycache"))
+
+
+def _read_cached_history(path: Path) -> pd.DataFrame:
+    return pd.read_csv(path, index_col=0, parse_dates=True, float_precision="round_trip")
+
+
+def _download_history(symbol: str, interval: str = "1d", start: date | None = None) -> pd.DataFrame:
+    """Return history for ``(symbol, interval)`` from ``start``, cached on disk per calendar day.
+
+    Cache files are plain CSV named ``{symbol}_{interval}_{day}_{start|max}.csv`` (no
+    pickles: the cache directory is user-configurable). A cached frame is reused when
+    it already reaches back to ``start``; otherwise the wider range is fetched and
+    replaces it.
+    """
+
+    cache_dir = _data_cache_dir()
+    stem = f"{symbol}_{interval}"
+    prefix = f"{stem}_{date.today().isoformat()}_"
+    for candidate in cache_dir.glob(f"{prefix}*.csv"):
+        tag = candidate.stem[len(prefix):]
+        try:
+            cached_start = None if tag == "max" else date.fromisoformat(tag)
+        except ValueError:
+            continue
+        if cached_start is not None and (start is None or cached_start > start):
+            continue
+        try:
+            return _read_cached_history(candidate)
+        except (OSError, ValueError) as exc:  # corrupt or truncated cache entry; refetch below
+            print(f"[WARN] Ignoring unreadable market data cache {candidate}: {exc}")
+    if start is None:
+        df = yf.download(symbol, period="max", interval=interval, auto_adjust=True, progress=False)
+    else:
+        df = yf.download(symbol, start=start, interval=interval, auto_adjust=True, progress=False)
     if isinstance(df.columns, pd.MultiIndex):
         df.columns = df.columns.droplevel(-1)
-    return df.tail(lookback_bars).dropna()
+    cache_path = cache_dir / f"{prefix}{start.isoformat() if start is not None else 'max'}.csv"
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        df.to_csv(cache_path)
+        # Earlier days, narrower windows and legacy pickle entries are all superseded.
+        for stale in (*cache_dir.glob(f"{stem}_*.csv"), *cache_dir.glob(f"{stem}_*.pkl")):
+            if stale != cache_path:
+                stale.unlink(missing_ok=True)
+    except OSError as exc:
+        print(f"[WARN] Failed to cache market data: {exc}")
+    return df
+
+
+def _load_data(symbol: str, lookback_bars: int, tf: str) -> pd.DataFrame:
+    # Calendar days padded by 1.5x so weekends and holidays still leave enough daily bars.
+    start = date.today() - timedelta(days=int(lookback_bars * 1.5) + 7)
+    df = _download_history(symbol, "1d", start)  # simple daily
+    return df.iloc[-lookback_bars:].dropna()
+
+
+def _pnl_loop(close: np.ndarray, sig: np.ndarray, scale: float) -> tuple[np.ndarray, np.ndarray]:
+    """Single-pass returns/equity kernel, compiled with numba when it is installed."""
+
+    n = close.shape[0]
+    ret = np.zeros(n)
+    eq = np.ones(n)
+    for i in range(1, n):
+        r = sig[i - 1] * scale * (close[i] / close[i - 1] - 1.0)
+        ret[i] = r
+        eq[i] = eq[i - 1] * (1.0 + r)
+    return ret, eq
+
+
+_pnl_kernel = njit(cache=True)(_pnl_loop) if njit is not None else None
 
 
 def _pnl_from_signals(df: pd.DataFrame, sig: pd.Series, size_pct: float = 10.0) -> pd.DataFrame:
-    ret = df["Close"].pct_change().fillna(0.0)
-    pos = sig.shift(1).fillna(0.0)  # enter on next bar open (simplified)
-    strat_ret = pos * (size_pct/100.0) * ret
-    eq = (1.0 + strat_ret).cumprod()
-    return pd.DataFrame({"ret": strat_ret, "eq": eq})
+    close = df["Close"].to_numpy(dtype=np.float64)
+    sig_arr = np.nan_to_num(sig.to_numpy(dtype=np.float64))
+    if _pnl_kernel is not None and len(close) > 0:
+        kernel_ret, kernel_eq = _pnl_kernel(close, sig_arr, size_pct / 100.0)
+        return pd.DataFrame({"ret": kernel_ret, "eq": kernel_eq}, index=df.index)
+    ret = np.zeros_like(close)
+    strat_ret = np.zeros_like(sig_arr)
+    if len(close) > 1:
+        np.divide(close[1:], close[:-1], out=ret[1:])
+        ret[1:] -= 1.0
+        strat_ret[1:] = sig_arr[:-1]  # enter on next bar open (simplified)
+    # Scale the shifted position into per-bar strategy returns in place.
+    strat_ret *= size_pct / 100.0
+    strat_ret *= ret
+    eq = np.add(strat_ret, 1.0)
+    np.cumprod(eq, out=eq)
+    return pd.DataFrame({"ret": strat_ret, "eq": eq}, index=df.index)
 
 
 def _safe_metric_value(value: object) -> float | None:
@@ -68,6 +185,25 @@ def _safe_metric_value(value: object) -> float | None:
 
 DEFAULT_CONFIG_PATH = Path("config/base.yaml")
 
+_ENV_VAR_RE = re.compile(r"\$\{([A-Za-z_][A-Za-z0-9_]*)\}")
+
+
+def _expand_env(text: str) -> str:
+    """Substitute ``${NAME}`` placeholders; unknown names are left untouched."""
+
+    names = set(_ENV_VAR_RE.findall(text))
+    if not names:
+        return text
+    env_map = {name: os.environ[name] for name in names if name in os.environ}
+    return _ENV_VAR_RE.sub(lambda m: env_map.get(m.group(1), m.group(0)), text)
+
+
+@functools.lru_cache(maxsize=32)
+def _parse_config_text(expanded: str) -> Any:
+    """Parse expanded config YAML; callers must copy before mutating the result."""
+
+    return yaml.load(expanded, Loader=_YamlLoader)
+
 
 def load_config(config_path: str) -> tuple[dict[str, Any], str]:
     _load_env()
@@ -75,14 +211,11 @@ def load_config(config_path: str) -> tuple[dict[str, Any], str]:
     override = os.environ.get("TAL_ACTIVE_CONFIG")
     if override and requested_path == DEFAULT_CONFIG_PATH:
         requested_path = Path(override)
-    raw = requested_path.read_text()
-    expanded = raw
-    for k, v in os.environ.items():
-        expanded = expanded.replace("${" + k + "}", v)
-    cfg_raw = yaml.safe_load(expanded)
+    expanded = _expand_env(requested_path.read_text())
+    cfg_raw = _parse_config_text(expanded)
     if not isinstance(cfg_raw, dict):
         raise TypeError("Config must decode to a mapping.")
-    cfg = cast(dict[str, Any], cfg_raw)
+    cfg = cast(dict[str, Any], copy.deepcopy(cfg_raw))
     os.environ["TAL_ACTIVE_CONFIG"] = str(requested_path.resolve())
     return cfg, expanded
 
@@ -94,13 +227,15 @@ def _load_config(config_path: str) -> dict[str, Any]:
     return cfg
 
 
-def _current_commit_sha() -> str | None:
+@functools.cache
+def _commit_sha_cached(cwd: str) -> str | None:
     try:
         result = subprocess.run(
             ["git", "rev-parse", "HEAD"],
             check=False,
             capture_output=True,
             text=True,
+            cwd=cwd,
         )
         if result.returncode == 0:
             return result.stdout.strip()
@@ -109,8 +244,35 @@ def _current_commit_sha() -> str | None:
     return None
 
 
+def _current_commit_sha() -> str | None:
+    """Return the HEAD commit for the working directory, resolved once per process."""
+
+    return _commit_sha_cached(os.getcwd())
+
+
+def _write_signals_parquet(sig: pd.Series, path: Path) -> None:
+    try:
+        pd.DataFrame({"signal": sig}).to_parquet(path)
+    except Exception as exc:  # pragma: no cover - optional dependency
+        print(f"[WARN] Failed to write signals parquet: {exc}")
+
+
 def run_backtest(config_path: str) -> None:
     cfg, expanded_config = load_config(config_path)
+    run_backtest_from_cfg(cfg, expanded_config)
+
+
+def run_backtest_from_cfg(cfg: dict[str, Any], expanded_config: str | None = None) -> None:
+    """Run a backtest for an already-parsed engine config.
+
+    ``expanded_config`` is the config text that gets hashed and snapshotted; when
+    omitted it is rendered from ``cfg`` and the snapshot becomes the active config.
+    """
+
+    in_memory = expanded_config is None
+    if expanded_config is None:
+        _load_env()
+        expanded_config = yaml.dump(cfg, Dumper=_YamlDumper)
     run_id = os.environ.get("RUN_ID", str(uuid.uuid4()))
     strategy_cfg = cfg.get("strategy", {})
     agent_id = cfg.get("agent_id") or cfg.get("agent", {}).get("id") or strategy_cfg.get("name", "unknown")
@@ -135,36 +297,41 @@ def run_backtest(config_path: str) -> None:
 
     ts_end = datetime.now(timezone.utc)
 
-    engine = get_engine(db_url)
-    record_run(
-        engine,
-        {
-            "id": run_id,
-            "agent_id": agent_id,
-            "mode": "backtest",
-            "ts_start": ts_start.isoformat(),
-            "ts_end": ts_end.isoformat(),
-            "commit_sha": commit_sha,
-            "config_hash": config_hash,
-        },
-        [
-            {"run_id": run_id, "name": name, "value": safe_metrics[name]}
-            for name in kpis
-        ],
-        engine_cfg=cfg,
-    )
-
     run_artifacts = artifacts_dir / "runs" / run_id
     run_artifacts.mkdir(parents=True, exist_ok=True)
-    (run_artifacts / "metrics.json").write_text(json.dumps(safe_metrics, indent=2))
-    (run_artifacts / "config.snapshot.yaml").write_text(expanded_config)
+    snapshot_path = run_artifacts / "config.snapshot.yaml"
 
-    if storage_cfg.get("write_signals_parquet", False):
-        try:
-            signal_df = pd.DataFrame({"signal": sig})
-            signal_df.to_parquet(run_artifacts / "signals.parquet")
-        except Exception as exc:  # pragma: no cover - optional dependency
-            print(f"[WARN] Failed to write signals parquet: {exc}")
+    engine = get_engine(db_url)
+    # Artifact files are written on worker threads while the DB insert runs here.
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        writes: list[Future[Any]] = [
+            pool.submit(write_json, run_artifacts / "metrics.json", safe_metrics),
+            pool.submit(snapshot_path.write_text, expanded_config),
+        ]
+        if storage_cfg.get("write_signals_parquet", False):
+            writes.append(pool.submit(_write_signals_parquet, sig, run_artifacts / "signals.parquet"))
+        record_run(
+            engine,
+            {
+                "id": run_id,
+                "agent_id": agent_id,
+                "mode": "backtest",
+                "ts_start": ts_start.isoformat(),
+                "ts_end": ts_end.isoformat(),
+                "commit_sha": commit_sha,
+                "config_hash": config_hash,
+            },
+            [
+                {"run_id": run_id, "name": name, "value": safe_metrics[name]}
+                for name in kpis
+            ],
+            engine_cfg=cfg,
+        )
+        for write in writes:
+            write.result()
+    if in_memory:
+        # Follow-up commands that read the default config resolve to this run's config.
+        os.environ["TAL_ACTIVE_CONFIG"] = str(snapshot_path.resolve())
 
     print(
         "[BACKTEST] run=%s agent=%s symbol=%s bars=%s eq_end=%.3f" % (
@@ -1,30 +1,49 @@
 from __future__ import annotations
 
-import json
 import os
-import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Literal, SupportsFloat
-
-# Autoload .env if present (do not override variables already exported)
-try:
-    from dotenv import find_dotenv, load_dotenv
-
-    load_dotenv(find_dotenv(usecwd=True), override=False)
-except Exception:
-    # Optional dependency; continue silently if unavailable or misconfigured
-    pass
+from typing import Annotated, Any, Literal
 
 import typer
-import yaml
 
 from tal import achievements, achievements_badges
-from tal.agents.registry import load_agent_config, to_engine_config
-from tal.backtest.engine import _load_config
-from tal.live.wrapper import _build_alpaca_client_from_env, _truthy, run_live_once
-from tal.league.manager import LeagueCfg, live_step_all, nightly_eval
-from tal.orchestrator.day_night import run_loop
-from tal.storage.db import fetch_metrics_for_runs, fetch_runs_since, get_engine
+
+_DOTENV_SENTINEL = "TAL_DOTENV_LOADED"
+
+
+def _load_dotenv_once() -> None:
+    """Autoload .env if present (do not override variables already exported).
+
+    Set TAL_SKIP_DOTENV=1 when the environment is injected directly (CI, containers).
+    After a load the cwd is recorded in TAL_DOTENV_LOADED; re-imports and child
+    processes started from the same directory inherit the values and skip the
+    directory walk and re-parse, while a different cwd still loads its own .env.
+    """
+    if os.environ.get("TAL_SKIP_DOTENV") == "1":
+        return
+    cwd = os.getcwd()
+    if os.environ.get(_DOTENV_SENTINEL) == cwd:
+        return
+    try:
+        from dotenv import find_dotenv, load_dotenv
+
+        load_dotenv(find_dotenv(usecwd=True), override=False)
+    except Exception:
+        # Optional dependency; continue silently if unavailable or misconfigured
+        return
+    os.environ[_DOTENV_SENTINEL] = cwd
+
+
+_load_dotenv_once()
+
+EvalWindow = Literal["1d", "7d", "30d"]
+EvalGroup = Literal["agent", "builder"]
+EvalFormat = Literal["table", "json"]
+
+_EXECUTE_FLAGS = frozenset({"1", "true", "yes"})
+_REAL_BROKER_MODES = frozenset({"alpaca_real", "alpaca", "alpaca-live"})
+_ALPACA_CREDENTIAL_VARS = ("ALPACA_API_KEY_ID", "ALPACA_API_SECRET_KEY")
 
 app = typer.Typer(help="Trading Agent Lab (CLI only)")
 agent_app = typer.Typer(help="Agent-specific commands")
@@ -37,13 +56,46 @@ app.add_typer(doctor_app, name="doctor")
 app.add_typer(achievements_app, name="achievements")
 
 
+def _build_alpaca_client_from_env(**kwargs: Any) -> Any:
+    # Resolved at call time so the Alpaca stack is only imported by commands that need it.
+    from tal.live.wrapper import _build_alpaca_client_from_env as build_client
+
+    return build_client(**kwargs)
+
+
+def _echo_json(obj: Any, *, sort_keys: bool = False) -> None:
+    from tal.storage.io import dumps_json
+
+    typer.echo(dumps_json(obj, sort_keys=sort_keys).decode("utf-8"))
+
+
+_FMT_2DP = "{:.2f}".format
+
+
 def _fmt_float(value: Any) -> str:
+    if isinstance(value, float):
+        return _FMT_2DP(value)
     try:
-        return f"{float(value):.2f}"
+        return _FMT_2DP(float(value))
     except (TypeError, ValueError):
         return str(value)
 
 
+def _ts_key(item: dict[str, Any]) -> str:
+    ts = item.get("ts")
+    # Stored timestamps are ISO strings; anything else still gets a comparable key.
+    return ts if isinstance(ts, str) else str(ts or "")
+
+
+def _sorted_achievement_entries(state: dict[str, Any]) -> list[dict[str, Any]]:
+    raw_entries = state.get("achievements", {})
+    if not raw_entries or not isinstance(raw_entries, dict):
+        return []
+    entries = [entry for entry in raw_entries.values() if isinstance(entry, dict)]
+    entries.sort(key=_ts_key)
+    return entries
+
+
 @achievements_app.command("ls")
 def achievements_ls() -> None:
     """List unlocked achievements."""
@@ -53,14 +105,11 @@ def achievements_ls() -> None:
     except Exception as exc:  # pragma: no cover - unexpected filesystem issues
         typer.echo(f"[achievements] failed to load state: {exc}", err=True)
         raise typer.Exit(code=1) from exc
-    raw_entries = state.get("achievements", {})
-    entries: list[dict[str, Any]] = []
-    if isinstance(raw_entries, dict):
-        for entry in raw_entries.values():
-            if isinstance(entry, dict):
-                entries.append(entry)
-    entries.sort(key=lambda item: str(item.get("ts", "")))
-    typer.echo(json.dumps(entries, indent=2, sort_keys=True))
+    entries = _sorted_achievement_entries(state)
+    if not entries:
+        typer.echo("[]")
+        return
+    _echo_json(entries, sort_keys=True)
 
 
 @achievements_app.command("reset")
@@ -151,11 +200,12 @@ def doctor_alpaca(
 ) -> None:
     """Validate Alpaca credentials and basic account connectivity."""
 
-    required = ["ALPACA_API_KEY_ID", "ALPACA_API_SECRET_KEY"]
-    missing = [key for key in required if not os.environ.get(key)]
-    if missing:
-        for key in missing:
-            typer.echo(f"[doctor] missing environment variable: {key}", err=True)
+    if not all(os.environ.get(key) for key in _ALPACA_CREDENTIAL_VARS):
+        missing = [key for key in _ALPACA_CREDENTIAL_VARS if not os.environ.get(key)]
+        typer.echo(
+            "\n".join(f"[doctor] missing environment variable: {key}" for key in missing),
+            err=True,
+        )
         raise typer.Exit(code=1)
 
     try:
@@ -167,8 +217,14 @@ def doctor_alpaca(
     feed_hint = os.environ.get("ALPACA_FEED")
 
     try:
-        market_open = bool(client.is_market_open())
-        account = client.get_account() or {}
+        # The three probes are independent round-trips; issue them concurrently.
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            open_future = pool.submit(client.is_market_open)
+            account_future = pool.submit(client.get_account)
+            price_future = pool.submit(client.get_last_price, symbol)
+            market_open = bool(open_future.result())
+            account = account_future.result() or {}
+            last_price = price_future.result()
         cash = _fmt_float(account.get("cash", 0.0))
         equity = _fmt_float(account.get("equity", account.get("portfolio_value", 0.0)))
         buying_power_val = (
@@ -178,22 +234,26 @@ def doctor_alpaca(
             or account.get("equity")
         )
         buying_power = _fmt_float(buying_power_val) if buying_power_val is not None else "n/a"
-        price = _fmt_float(client.get_last_price(symbol))
+        price = _fmt_float(last_price)
     except Exception as exc:  # pragma: no cover - depends on runtime client
         typer.echo(f"[doctor] runtime check failed: {exc}", err=True)
         raise typer.Exit(code=1) from exc
 
-    symbol_upper = symbol.upper()
-    typer.echo(f"market_open: {market_open}")
-    typer.echo(f"account: cash={cash} equity={equity} buying_power={buying_power}")
-    typer.echo(f"latest_price[{symbol_upper}]: {price}")
+    lines = [
+        f"market_open: {market_open}",
+        f"account: cash={cash} equity={equity} buying_power={buying_power}",
+        f"latest_price[{symbol.upper()}]: {price}",
+    ]
     if feed_hint:
-        typer.echo(f"feed_hint: {feed_hint.lower()}")
+        lines.append(f"feed_hint: {feed_hint.lower()}")
+
+    from tal.live.wrapper import _truthy
 
     gate_enabled = _truthy(os.environ.get("REAL_TRADING_ENABLED"))
-    typer.echo(f"real_trading_enabled: {gate_enabled}")
+    lines.append(f"real_trading_enabled: {gate_enabled}")
     live_broker = os.environ.get("LIVE_BROKER", "alpaca_paper")
-    typer.echo(f"live_broker: {live_broker}")
+    lines.append(f"live_broker: {live_broker}")
+    typer.echo("\n".join(lines))
     broker_key = live_broker.strip().lower()
     if broker_key == "alpaca_real" and not gate_enabled:
         typer.secho(
@@ -207,13 +267,14 @@ def agent_backtest(
     config: str = typer.Option(..., "--config", help="Path to agent config YAML.")
 ) -> None:
     """Backtest for a specific agent YAML."""
+    from tal.agents.registry import load_agent_config, to_engine_config
+    from tal.backtest.engine import run_backtest_from_cfg
+
     config_path = Path(config)
     spec = load_agent_config(str(config_path))
     engine_cfg = to_engine_config(spec)
-    tmp_path = _dump_temp_engine_cfg(engine_cfg)
-    from tal.backtest.engine import run_backtest
 
-    run_backtest(tmp_path)
+    run_backtest_from_cfg(engine_cfg)
 
 
 @agent_app.command("run")
@@ -221,39 +282,34 @@ def agent_run(
     config: str = typer.Option(..., "--config", help="Path to agent config YAML.")
 ) -> None:
     """Run orchestrator loop for a specific agent YAML."""
+    from tal.agents.registry import load_agent_config, to_engine_config
+    from tal.orchestrator.day_night import run_loop_from_cfg
+
     config_path = Path(config)
     spec = load_agent_config(str(config_path))
     engine_cfg = to_engine_config(spec)
-    tmp_path = _dump_temp_engine_cfg(engine_cfg)
-    from tal.orchestrator.day_night import run_loop as loop
 
-    loop(tmp_path)
-
-
-def _dump_temp_engine_cfg(engine_cfg: dict[str, Any]) -> str:
-    tmp = tempfile.NamedTemporaryFile("w", suffix=".yaml", delete=False)
-    try:
-        yaml.safe_dump(engine_cfg, tmp)
-        tmp.flush()
-    finally:
-        tmp.close()
-    return tmp.name
+    run_loop_from_cfg(engine_cfg)
 
 
 @league_app.command("live-once")
 def league_live_once(config: str = "config/base.yaml") -> None:
     """Run one live step for every league agent."""
+    from tal.backtest.engine import _load_config
+    from tal.league.manager import LeagueCfg, live_step_all
 
     cfg = _load_config(config)
     lc = LeagueCfg(**cfg.get("league", {}))
     db_url = cfg.get("storage", {}).get("db_url", "sqlite:///./lab.db")
     res = live_step_all(db_url, lc.agents_dir, lc.artifacts_dir)
-    print(json.dumps(res, indent=2))
+    _echo_json(res)
 
 
 @league_app.command("nightly")
 def league_nightly(config: str = "config/base.yaml") -> None:
     """Evaluate recent runs and compute allocations."""
+    from tal.backtest.engine import _load_config
+    from tal.league.manager import LeagueCfg, nightly_eval
 
     cfg = _load_config(config)
     lc = LeagueCfg(**cfg.get("league", {}))
@@ -265,12 +321,14 @@ def league_nightly(config: str = "config/base.yaml") -> None:
         lc.top_k,
         lc.retire_k,
     )
-    print(json.dumps(res, indent=2))
+    _echo_json(res)
 
 
 @app.command()
 def orchestrate(config: str = "config/base.yaml") -> None:
     """Run the day/night loop (paper during market; tune after hours)."""
+    from tal.orchestrator.day_night import run_loop
+
     run_loop(config_path=config)
 
 
@@ -289,94 +347,92 @@ def live_once(
 ) -> None:
     """Execute one live step using the configured broker (paper by default)."""
 
+    from tal.agents.registry import (
+        _VAR,
+        agent_spec_from_mapping,
+        load_agent_config,
+        to_engine_config,
+    )
     from tal.backtest.engine import load_config
+    from tal.live.wrapper import run_live_once
 
-    cfg, _ = load_config(config)
+    cfg, expanded = load_config(config)
     if isinstance(cfg.get("universe"), list) or "components" in cfg:
-        spec = load_agent_config(config)
+        # Agent-style YAML: validate the mapping already parsed above. The engine
+        # leaves unknown ${VAR} placeholders in place while the agent loader blanks
+        # them, so keep the agent loader's behaviour when any are left over.
+        if _VAR.search(expanded):
+            spec = load_agent_config(config)
+        else:
+            spec = agent_spec_from_mapping(cfg)
         cfg = to_engine_config(spec)
     res = run_live_once(cfg)
-    print(json.dumps(res, indent=2))
+    _echo_json(res)
 
 
 @app.command(name="eval")
 def evaluate(
-    since: str = typer.Option(
-        "7d",
-        "--since",
-        case_sensitive=False,
-        help="Lookback window (1d, 7d, 30d).",
-        show_default=True,
-    ),
-    output_format: str = typer.Option(
-        "table",
-        "--format",
-        case_sensitive=False,
-        help="Output format: table or json.",
-        show_default=True,
-    ),
-    group: str = typer.Option(
-        "agent",
-        "--group",
-        case_sensitive=False,
-        help="Grouping for leaderboard (agent or builder).",
-        show_default=True,
-    ),
-    config: str = typer.Option(
-        "config/base.yaml",
-        "--config",
-        help="Path to config for storage settings.",
-        show_default=True,
-    ),
+    since: Annotated[
+        EvalWindow,
+        typer.Option(
+            "--since",
+            case_sensitive=False,
+            help="Lookback window (1d, 7d, 30d).",
+            show_default=True,
+        ),
+    ] = "7d",
+    output_format: Annotated[
+        EvalFormat,
+        typer.Option(
+            "--format",
+            case_sensitive=False,
+            help="Output format: table or json.",
+            show_default=True,
+        ),
+    ] = "table",
+    group: Annotated[
+        EvalGroup,
+        typer.Option(
+            "--group",
+            case_sensitive=False,
+            help="Grouping for leaderboard (agent or builder).",
+            show_default=True,
+        ),
+    ] = "agent",
+    config: Annotated[
+        str,
+        typer.Option(
+            "--config",
+            help="Path to config for storage settings.",
+            show_default=True,
+        ),
+    ] = "config/base.yaml",
 ) -> None:
     """Evaluate the latest runs with optional grouping."""
 
     from tal.backtest.engine import load_config
-    from tal.evaluation.leaderboard import format_json, format_table, resolve_window, summarize
-
-    since_key = since.lower()
-    try:
-        _, since_iso = resolve_window(since_key)
-    except ValueError as exc:
-        raise typer.BadParameter(str(exc)) from exc
-
-    window_days = {"1d": 1, "7d": 7, "30d": 30}.get(since_key)
-    if window_days is None:
-        raise typer.BadParameter("Unsupported window; choose 1d, 7d, or 30d.")
+    from tal.evaluation.leaderboard import (
+        WINDOW_DAYS,
+        format_json,
+        format_table,
+        resolve_window,
+        summarize,
+    )
+    from tal.storage.db import fetch_metric_sum_since, get_engine
 
-    group_key = group.lower()
-    if group_key not in {"agent", "builder"}:
-        raise typer.BadParameter("Group must be 'agent' or 'builder'.")
+    # Choices are validated and normalized to their canonical (lowercase) spelling by typer.
+    _, since_iso = resolve_window(since)
+    window_days = WINDOW_DAYS[since]
 
     cfg, _ = load_config(config)
     storage_cfg = cfg.get("storage", {})
     db_url = storage_cfg.get("db_url", "sqlite:///./lab.db")
 
     engine = get_engine(db_url)
-    rows = summarize(engine, since_days=window_days, group=group_key)
+    rows = summarize(engine, since_days=window_days, group=group)
 
-    pnl_pct_total = 0.0
     try:
-        runs = fetch_runs_since(engine, since_iso)
-        if runs:
-            run_ids = [str(row.get("id")) for row in runs if row.get("id") is not None]
-            metrics = fetch_metrics_for_runs(engine, run_ids)
-            for metric in metrics:
-                if metric.get("name") != "pnl":
-                    continue
-                value_obj = metric.get("value")
-                if isinstance(value_obj, (int, float)):
-                    pnl_pct_total += float(value_obj)
-                    continue
-                if isinstance(value_obj, SupportsFloat):
-                    pnl_pct_total += float(value_obj)
-                    continue
-                if isinstance(value_obj, str):
-                    try:
-                        pnl_pct_total += float(value_obj)
-                        continue
-                    except ValueError:
-                        continue
+        pnl_pct_total = fetch_metric_sum_since(engine, since_iso, "pnl")
     except Exception:
         pnl_pct_total = 0.0
 
@@ -387,21 +443,18 @@ def evaluate(
         capital = 10_000.0
     pnl_dollars = max(0.0, pnl_pct_total * capital)
     execute_flag = os.getenv("LIVE_EXECUTE", "0").lower()
-    execute_enabled = execute_flag in {"1", "true", "yes"}
+    execute_enabled = execute_flag in _EXECUTE_FLAGS
     broker_mode_raw = os.getenv("LIVE_BROKER", "")
     broker_mode = broker_mode_raw.strip().lower()
-    is_real_broker = broker_mode in {"alpaca_real", "alpaca", "alpaca-live"}
+    is_real_broker = broker_mode in _REAL_BROKER_MODES
     achievement_mode: Literal["paper", "real"] = (
         "real" if is_real_broker and execute_enabled else "paper"
     )
 
-    fmt = output_format.lower()
-    if fmt not in {"table", "json"}:
-        raise typer.BadParameter("Format must be 'table' or 'json'.")
-    if fmt == "json":
+    if output_format == "json":
         typer.echo(format_json(rows))
     else:
-        typer.echo(format_table(rows, group=group_key))
+        typer.echo(format_table(rows, group=group))
 
     if pnl_dollars > 0:
         try:
@@ -418,11 +471,13 @@ def agent_live(
     config: str = typer.Option(..., "--config", help="Path to agent config YAML.")
 ) -> None:
     """Run one live step for a specific AgentSpec YAML."""
+    from tal.agents.registry import load_agent_config, to_engine_config
+    from tal.live.wrapper import run_live_once
 
     spec = load_agent_config(config)
     engine_cfg = to_engine_config(spec)
     res = run_live_once(engine_cfg)
-    print(json.dumps(res, indent=2))
+    _echo_json(res)
 
 
 if __name__ == "__main__":
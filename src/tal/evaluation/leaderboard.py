@@ -2,21 +2,21 @@
 
 from __future__ import annotations
 
-import json
+import io
+import math
 import numbers
 from collections import defaultdict
-from datetime import datetime, timedelta, timezone
+from datetime import UTC, datetime, timedelta
 from typing import Any, Mapping, Sequence, cast
 
+import numpy as np
 import pandas as pd
 
-from tal.storage.db import fetch_agents, fetch_metrics_for_runs, fetch_runs_since
+from tal.storage.db import fetch_agents, fetch_metrics_since, fetch_runs_since
+from tal.storage.io import dumps_json
 
-WINDOW_MAP = {
-    "1d": timedelta(days=1),
-    "7d": timedelta(days=7),
-    "30d": timedelta(days=30),
-}
+WINDOW_DAYS = {"1d": 1, "7d": 7, "30d": 30}
+WINDOW_MAP = {key: timedelta(days=days) for key, days in WINDOW_DAYS.items()}
 
 
 def resolve_window(key: str, now: datetime | None = None) -> tuple[datetime, str]:
@@ -24,55 +24,80 @@ def resolve_window(key: str, now: datetime | None = None) -> tuple[datetime, str
 
     if key not in WINDOW_MAP:
         raise ValueError(f"Unsupported window '{key}'. Choose from {', '.join(WINDOW_MAP)}")
-    now = now or datetime.now(timezone.utc)
+    now = now or datetime.now(UTC)
     since_dt = now - WINDOW_MAP[key]
     return since_dt, since_dt.isoformat()
 
 
+_F4 = "{:.4f}".format
+
+_METRIC_COLS = ("profit_factor", "sharpe", "max_dd", "win_rate")
+_LEADERBOARD_COLS = ["agent_id", "runs", *_METRIC_COLS]
+
+
+def _parse_ts(value: Any) -> datetime | None:
+    if not isinstance(value, str):
+        return None
+    try:
+        ts = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    return ts if ts.tzinfo is not None else ts.replace(tzinfo=UTC)
+
+
+def _metric_float(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _desc_nan_last(value: float) -> tuple[int, float]:
+    return (1, 0.0) if math.isnan(value) else (0, -value)
+
+
 def build_leaderboard(engine: Any, since_iso: str) -> pd.DataFrame:
     """Build a leaderboard DataFrame for runs since the provided ISO timestamp."""
 
     runs = fetch_runs_since(engine, since_iso)
     if not runs:
-        return pd.DataFrame(columns=["agent_id", "runs", "profit_factor", "sharpe", "max_dd", "win_rate"])
-
-    runs_df = pd.DataFrame(runs)
-    runs_df["ts_end"] = pd.to_datetime(runs_df["ts_end"], utc=True, errors="coerce")
-    runs_df["ts_start"] = pd.to_datetime(runs_df["ts_start"], utc=True, errors="coerce")
-
-    metrics = fetch_metrics_for_runs(engine, runs_df["id"].tolist())
-    metrics_df = pd.DataFrame(metrics)
-    if not metrics_df.empty:
-        metrics_pivot = metrics_df.pivot(index="run_id", columns="name", values="value")
-    else:
-        metrics_pivot = pd.DataFrame()
-
-    counts = runs_df.groupby("agent_id").size().rename("runs").reset_index()
-
-    runs_df = runs_df.sort_values("ts_end")
-    latest = runs_df.groupby("agent_id", as_index=False).tail(1)
-    latest = latest.merge(counts, on="agent_id", how="left")
-    metric_cols = ["profit_factor", "sharpe", "max_dd", "win_rate"]
-    if not metrics_pivot.empty:
-        latest = latest.merge(
-            metrics_pivot,
-            left_on="id",
-            right_index=True,
-            how="left",
+        return pd.DataFrame(columns=_LEADERBOARD_COLS)
+
+    # One pass over runs: count per agent and keep the run with the latest ts_end
+    # (unparseable timestamps sort last, matching the previous NaT ordering).
+    counts: dict[Any, int] = {}
+    latest: dict[Any, tuple[tuple[int, datetime], Any]] = {}
+    floor = datetime.min.replace(tzinfo=UTC)
+    for run in runs:
+        agent_id = run.get("agent_id")
+        if agent_id is None:
+            continue
+        counts[agent_id] = counts.get(agent_id, 0) + 1
+        ts_end = _parse_ts(run.get("ts_end"))
+        key = (1, floor) if ts_end is None else (0, ts_end)
+        current = latest.get(agent_id)
+        if current is None or key >= current[0]:
+            latest[agent_id] = (key, run.get("id"))
+
+    metrics_by_run: dict[Any, dict[str, Any]] = {}
+    for metric in fetch_metrics_since(engine, since_iso, _METRIC_COLS):
+        metrics_by_run.setdefault(metric["run_id"], {})[str(metric["name"])] = metric["value"]
+
+    rows: list[dict[str, Any]] = []
+    for agent_id, (_, run_id) in latest.items():
+        run_metrics = metrics_by_run.get(run_id, {})
+        row: dict[str, Any] = {"agent_id": agent_id, "runs": counts[agent_id]}
+        for col in _METRIC_COLS:
+            row[col] = _metric_float(run_metrics.get(col))
+        rows.append(row)
+    rows.sort(
+        key=lambda r: (
+            _desc_nan_last(r["profit_factor"]),
+            _desc_nan_last(r["sharpe"]),
+            _desc_nan_last(r["max_dd"]),
         )
-    else:
-        for col in metric_cols:
-            latest[col] = pd.NA
-
-    leaderboard = latest[["agent_id", "runs", *metric_cols]].copy()
-    leaderboard["runs"] = leaderboard["runs"].fillna(0).astype(int)
-    leaderboard[metric_cols] = leaderboard[metric_cols].apply(pd.to_numeric, errors="coerce")
-    leaderboard = leaderboard.sort_values(
-        by=["profit_factor", "sharpe", "max_dd"],
-        ascending=[False, False, False],
-        na_position="last",
-    ).reset_index(drop=True)
-    return leaderboard
+    )
+    return pd.DataFrame(rows, columns=_LEADERBOARD_COLS)
 
 
 def _ensure_engine(db: Any) -> Any:
@@ -81,7 +106,7 @@ def _ensure_engine(db: Any) -> Any:
 
 def by_agent(db: Any, since_days: int = 30) -> list[dict[str, Any]]:
     engine = _ensure_engine(db)
-    since_dt = datetime.now(timezone.utc) - timedelta(days=since_days)
+    since_dt = datetime.now(UTC) - timedelta(days=since_days)
     df = build_leaderboard(engine, since_dt.isoformat())
     records = cast(list[dict[str, Any]], df.to_dict(orient="records"))
     agents_meta = {row["agent_id"]: row for row in fetch_agents(engine)}
@@ -100,14 +125,13 @@ def by_agent(db: Any, since_days: int = 30) -> list[dict[str, Any]]:
     return records
 
 
-def _safe_add_metric(container: dict[str, list[float]], key: str, value: Any) -> None:
+def _safe_metric(value: Any) -> float | None:
     if pd.isna(value):
-        return
+        return None
     try:
-        numeric = float(value)
+        return float(value)
     except (TypeError, ValueError):
-        return
-    container.setdefault(key, []).append(numeric)
+        return None
 
 
 def by_builder(db: Any, since_days: int = 30) -> list[dict[str, Any]]:
@@ -115,7 +139,8 @@ def by_builder(db: Any, since_days: int = 30) -> list[dict[str, Any]]:
     if not rows:
         return []
     groups: dict[str, dict[str, Any]] = {}
-    metrics: dict[str, dict[str, list[float]]] = defaultdict(dict)
+    # Running [sum, count] per builder and metric, accumulated in the same walk.
+    totals: dict[str, dict[str, list[float]]] = defaultdict(dict)
     for row in rows:
         builder = row.get("builder_name") or "unknown"
         grp = groups.setdefault(
@@ -131,17 +156,23 @@ def by_builder(db: Any, since_days: int = 30) -> list[dict[str, Any]]:
             grp["builder_model"] = row.get("builder_model")
         grp["agent_ids"].append(str(row.get("agent_id") or ""))
         grp["runs"] += int(row.get("runs", 0))
-        metric_container = metrics.setdefault(builder, {})
-        for metric in ("profit_factor", "sharpe", "max_dd", "win_rate"):
-            _safe_add_metric(metric_container, metric, row.get(metric))
+        builder_totals = totals[builder]
+        for metric in _METRIC_COLS:
+            numeric = _safe_metric(row.get(metric))
+            if numeric is None:
+                continue
+            acc = builder_totals.get(metric)
+            if acc is None:
+                builder_totals[metric] = [numeric, 1.0]
+            else:
+                acc[0] += numeric
+                acc[1] += 1.0
     results: list[dict[str, Any]] = []
     for builder, info in groups.items():
-        metric_container = metrics.get(builder, {})
-        for metric, values in metric_container.items():
-            if values:
-                info[metric] = sum(values) / len(values)
-        for metric in ("profit_factor", "sharpe", "max_dd", "win_rate"):
-            info.setdefault(metric, None)
+        builder_totals = totals[builder]
+        for metric in _METRIC_COLS:
+            acc = builder_totals.get(metric)
+            info[metric] = acc[0] / acc[1] if acc else None
         results.append(info)
     results.sort(
         key=lambda r: (
@@ -186,25 +217,48 @@ def print_table(rows: Sequence[Mapping[str, Any]], group: str = "agent") -> str:
         ]
 
     def fmt(value: Any) -> str:
+        # Concrete type checks first (metric cells are float, text cells str, run
+        # counts int); ABC isinstance checks and pd.isna only for anything else.
+        value_type = type(value)
+        if value_type is float or value_type is np.float64:
+            return "-" if math.isnan(value) else _F4(value)
+        if value_type is str:
+            return value
+        if value is None:
+            return "-"
+        if value_type is int or value_type is np.int64:
+            return str(value)
         if pd.isna(value):
             return "-"
         if isinstance(value, numbers.Integral):
             return str(int(value))
         if isinstance(value, numbers.Real):
-            return f"{value:.4f}"
-        if value is None:
-            return "-"
+            return _F4(value)
         return str(value)
 
-    table_rows: list[list[str]] = []
-    for row in rows:
-        table_rows.append([fmt(row.get(col)) for col in columns])
+    # Format every cell exactly once; widths and output reuse the same strings.
+    table_rows = [[fmt(row.get(col)) for col in columns] for row in rows]
+    widths = [len(col) for col in columns]
+    for cells in table_rows:
+        for idx, cell in enumerate(cells):
+            widths[idx] = max(widths[idx], len(cell))
+
+    buf = io.StringIO()
+
+    def write_line(cells: Sequence[str]) -> None:
+        for idx, cell in enumerate(cells):
+            if idx:
+                buf.write(" | ")
+            buf.write(cell)
+            buf.write(" " * (widths[idx] - len(cell)))
 
-    widths = [max(len(col), *(len(r[idx]) for r in table_rows)) for idx, col in enumerate(columns)]
-    header = " | ".join(col.ljust(widths[idx]) for idx, col in enumerate(columns))
-    separator = "-+-".join("-" * widths[idx] for idx in range(len(columns)))
-    body = [" | ".join(r[idx].ljust(widths[idx]) for idx in range(len(columns))) for r in table_rows]
-    return "\n".join([header, separator, *body])
+    write_line(columns)
+    buf.write("\n")
+    buf.write("-+-".join("-" * width for width in widths))
+    for cells in table_rows:
+        buf.write("\n")
+        write_line(cells)
+    return buf.getvalue()
 
 
 def format_table(data: Sequence[Mapping[str, Any]] | pd.DataFrame, group: str = "agent") -> str:
@@ -222,10 +276,10 @@ def format_table(data: Sequence[Mapping[str, Any]] | pd.DataFrame, group: str =
 
 
 def format_json(data: Sequence[Mapping[str, Any]] | pd.DataFrame) -> str:
-    """Format the leaderboard as JSON."""
+    """Format the leaderboard as JSON; missing (NaN) metrics are written as ``null``."""
 
     if isinstance(data, pd.DataFrame):
         records = cast(list[dict[str, Any]], data.to_dict(orient="records"))
     else:
         records = [dict(row) for row in data]
-    return json.dumps(records, indent=2)
+    return dumps_json(records).decode("utf-8")
@@ -8,62 +8,163 @@ from typing import Dict
 import numpy as np
 import pandas as pd
 
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - numba is an optional extra
+    njit = None  # type: ignore[assignment, unused-ignore]
+
 TRADING_DAYS = 252
 
 
-def profit_factor(returns: pd.Series) -> float:
-    """Return the ratio of gross gains to gross losses."""
+def _as_array(series: pd.Series) -> np.ndarray:
+    return series.to_numpy(dtype=np.float64)
 
-    gains = returns.clip(lower=0).sum()
-    losses = -returns.clip(upper=0).sum()
+
+# The ndarray helpers skip NaNs the same way the pandas reductions did.
+def _profit_factor(r: np.ndarray) -> float:
+    gains = np.nansum(np.maximum(r, 0.0))
+    losses = -np.nansum(np.minimum(r, 0.0))
     if np.isclose(losses, 0.0):
         return float("inf") if gains > 0 else 0.0
     return float(gains / losses)
 
 
-def max_drawdown(equity: pd.Series) -> float:
-    """Return the maximum peak-to-trough drawdown as a negative number."""
-
-    if equity.empty:
+def _max_drawdown(e: np.ndarray) -> float:
+    if e.size == 0:
         return 0.0
-    roll_max = equity.cummax()
-    dd = equity / roll_max - 1.0
-    return float(dd.min())
+    roll_max = np.fmax.accumulate(e)
+    return float(np.nanmin(e / roll_max - 1.0))
 
 
-def sharpe_ratio(returns: pd.Series) -> float:
-    """Return the annualised Sharpe ratio using daily returns."""
-
-    if returns.empty:
+def _sharpe_ratio(r: np.ndarray) -> float:
+    if r.size == 0:
         return 0.0
-    mean = returns.mean()
-    std = returns.std(ddof=0)
+    mean = np.nanmean(r)
+    std = np.nanstd(r)
     if np.isclose(std, 0.0):
         return 0.0
     return float((mean / std) * math.sqrt(TRADING_DAYS))
 
 
-def win_rate(returns: pd.Series) -> float:
-    """Return the percentage of winning periods."""
-
-    if returns.empty:
+def _win_rate(r: np.ndarray) -> float:
+    if r.size == 0:
         return 0.0
-    wins = (returns > 0).sum()
-    losses = (returns < 0).sum()
+    wins = np.count_nonzero(r > 0)
+    losses = np.count_nonzero(r < 0)
     total = wins + losses
     if total == 0:
         return 0.0
     return float(wins / total)
 
 
+def _kpi_loop(r: np.ndarray, e: np.ndarray) -> tuple[float, float, float, float]:
+    """Single-pass KPI kernel, compiled with numba when it is installed.
+
+    Mirrors the ndarray helpers above (including NaN skipping and the
+    ``np.isclose`` zero checks) without allocating temporaries.
+    """
+
+    gains = 0.0
+    losses = 0.0
+    total = 0.0
+    count = 0
+    wins = 0
+    lost = 0
+    for x in r:
+        if math.isnan(x):
+            continue
+        if x > 0.0:
+            gains += x
+            wins += 1
+        elif x < 0.0:
+            losses -= x
+            lost += 1
+        total += x
+        count += 1
+
+    if abs(losses) <= 1e-8:
+        pf = math.inf if gains > 0.0 else 0.0
+    else:
+        pf = gains / losses
+
+    if r.shape[0] == 0:
+        sharpe = 0.0
+    elif count == 0:
+        sharpe = math.nan
+    else:
+        mean = total / count
+        sq = 0.0
+        for x in r:
+            if not math.isnan(x):
+                sq += (x - mean) * (x - mean)
+        std = math.sqrt(sq / count)
+        sharpe = 0.0 if std <= 1e-8 else (mean / std) * math.sqrt(TRADING_DAYS)
+
+    win = 0.0 if wins + lost == 0 else wins / (wins + lost)
+
+    if e.shape[0] == 0:
+        max_dd = 0.0
+    else:
+        max_dd = math.nan
+        roll_max = math.nan
+        for x in e:
+            if math.isnan(x):
+                continue
+            if math.isnan(roll_max) or x > roll_max:
+                roll_max = x
+            dd = x / roll_max - 1.0
+            if math.isnan(max_dd) or dd < max_dd:
+                max_dd = dd
+
+    return pf, sharpe, max_dd, win
+
+
+_kpi_kernel = njit(cache=True)(_kpi_loop) if njit is not None else None
+
+
+def profit_factor(returns: pd.Series) -> float:
+    """Return the ratio of gross gains to gross losses."""
+
+    return _profit_factor(_as_array(returns))
+
+
+def max_drawdown(equity: pd.Series) -> float:
+    """Return the maximum peak-to-trough drawdown as a negative number."""
+
+    return _max_drawdown(_as_array(equity))
+
+
+def sharpe_ratio(returns: pd.Series) -> float:
+    """Return the annualised Sharpe ratio using daily returns."""
+
+    return _sharpe_ratio(_as_array(returns))
+
+
+def win_rate(returns: pd.Series) -> float:
+    """Return the percentage of winning periods."""
+
+    return _win_rate(_as_array(returns))
+
+
 def compute_kpis(returns: pd.Series, equity: pd.Series) -> Dict[str, float]:
     """Compute the canonical Trading Agent Lab KPI set."""
 
-    pnl = float(equity.iloc[-1] - 1.0) if not equity.empty else 0.0
+    r = _as_array(returns)
+    e = _as_array(equity)
+    pnl = float(e[-1] - 1.0) if e.size else 0.0
+    if _kpi_kernel is not None:
+        pf, sharpe, max_dd, win = _kpi_kernel(r, e)
+        return {
+            "pnl": pnl,
+            "profit_factor": float(pf),
+            "sharpe": float(sharpe),
+            "max_dd": float(max_dd),
+            "win_rate": float(win),
+        }
     return {
         "pnl": pnl,
-        "profit_factor": profit_factor(returns),
-        "sharpe": sharpe_ratio(returns),
-        "max_dd": max_drawdown(equity),
-        "win_rate": win_rate(returns),
+        "profit_factor": _profit_factor(r),
+        "sharpe": _sharpe_ratio(r),
+        "max_dd": _max_drawdown(e),
+        "win_rate": _win_rate(r),
     }
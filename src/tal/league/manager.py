@@ -1,16 +1,21 @@
 from __future__ import annotations
 
-import json
-from glob import glob
+import functools
+import math
+import os
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Callable
 
+import numpy as np
 from pydantic import BaseModel
 
 from tal.agents.registry import load_agent_config, to_engine_config
 from tal.live.adapters import AlpacaClient
 from tal.live.wrapper import run_live_once
 from tal.storage.db import Engine
+from tal.storage.io import write_json
 
 
 class LeagueCfg(BaseModel):
@@ -21,8 +26,29 @@ class LeagueCfg(BaseModel):
     since_days: int = 30
 
 
+_MAX_LIVE_WORKERS = 32
+
+
+@functools.lru_cache(maxsize=8)
+def _scan_agent_files(agents_dir: str, mtime_ns: int) -> tuple[str, ...]:
+    # mtime_ns is part of the cache key: adding or removing a file bumps it.
+    with os.scandir(agents_dir) as entries:
+        return tuple(
+            sorted(
+                os.path.join(agents_dir, entry.name)
+                for entry in entries
+                if entry.name.endswith(".yaml") and not entry.name.startswith(".")
+            )
+        )
+
+
 def list_agent_files(agents_dir: str) -> list[str]:
-    return sorted(glob(str(Path(agents_dir) / "*.yaml")))
+    root = str(Path(agents_dir))
+    try:
+        mtime_ns = os.stat(root).st_mtime_ns
+    except OSError:
+        return []
+    return list(_scan_agent_files(root, mtime_ns))
 
 
 def _force_db_url(cfg: dict[str, Any], db_url: str | None) -> None:
@@ -43,8 +69,8 @@ def live_step_all(
 
     base_artifacts = Path(artifacts_dir)
     base_artifacts.mkdir(parents=True, exist_ok=True)
-    results: list[dict] = []
-    for file_path in list_agent_files(agents_dir):
+
+    def _prepare(file_path: str) -> tuple[str, str, dict[str, Any]]:
         spec = load_agent_config(file_path)
         cfg = to_engine_config(spec)
         _force_db_url(cfg, engine_db_url)
@@ -53,15 +79,62 @@ def live_step_all(
         live_cfg = cfg.setdefault("live", {})
         live_cfg["ledger_dir"] = str(base_artifacts / "live" / agent_id)
         adapter_name = live_cfg.get("adapter") or live_cfg.get("broker", "sim")
+        return agent_id, adapter_name, cfg
+
+    def _step(prepared: tuple[str, str, dict[str, Any]]) -> dict:
+        agent_id, adapter_name, cfg = prepared
         injected_client = None
         if adapter_name == "alpaca" and alpaca_client_factory is not None:
             injected_client = alpaca_client_factory(cfg)
         res = run_live_once(cfg, alpaca_client=injected_client)
-        results.append({"agent_id": agent_id, **res})
-    (base_artifacts / "last_live.json").write_text(json.dumps(results, indent=2))
+        return {"agent_id": agent_id, **res}
+
+    prepared = [_prepare(file_path) for file_path in list_agent_files(agents_dir)]
+    # Only sim agents with their own ledger dir run concurrently. Alpaca agents share
+    # one broker account (position/cash guardrails must see earlier fills) and agents
+    # with a duplicate id share a ledger, so those step one at a time in file order.
+    id_counts = Counter(agent_id for agent_id, _, _ in prepared)
+    parallel = [
+        idx
+        for idx, (agent_id, adapter_name, _) in enumerate(prepared)
+        if adapter_name == "sim" and id_counts[agent_id] == 1
+    ]
+    results: list[dict] = [{} for _ in prepared]
+    if len(parallel) > 1:
+        with ThreadPoolExecutor(max_workers=min(_MAX_LIVE_WORKERS, len(parallel))) as pool:
+            for idx, res in zip(parallel, pool.map(_step, (prepared[i] for i in parallel))):
+                results[idx] = res
+    else:
+        parallel = []
+    concurrent = set(parallel)
+    for idx, item in enumerate(prepared):
+        if idx not in concurrent:
+            results[idx] = _step(item)
+    write_json(base_artifacts / "last_live.json", results)
     return results
 
 
+def _rank_value(value: Any) -> float:
+    if value is None:
+        return float("-inf")
+    number = float(value)
+    return float("-inf") if math.isnan(number) else number
+
+
+def _rank_rows(rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Sort rows by sharpe, then profit_factor, descending; missing values rank last.
+
+    ``np.lexsort`` is stable, so sorting the negated keys ascending keeps the
+    original order among ties, exactly like ``sorted(..., reverse=True)``.
+    """
+
+    n = len(rows)
+    sharpe = np.fromiter((_rank_value(r.get("sharpe")) for r in rows), dtype=np.float64, count=n)
+    pf = np.fromiter((_rank_value(r.get("profit_factor")) for r in rows), dtype=np.float64, count=n)
+    order = np.lexsort((-pf, -sharpe))
+    return [rows[i] for i in order]
+
+
 def nightly_eval(
     engine_db_url: str,
     artifacts_dir: str,
@@ -75,16 +148,7 @@ def nightly_eval(
     from tal.evaluation.leaderboard import summarize
 
     rows = summarize(db, since_days=since_days, group="agent")
-    rows_sorted = sorted(
-        rows,
-        key=lambda r: (
-            r.get("sharpe") if r.get("sharpe") is not None else float("-inf"),
-            r.get("profit_factor")
-            if r.get("profit_factor") is not None
-            else float("-inf"),
-        ),
-        reverse=True,
-    )
+    rows_sorted = _rank_rows(rows)
     promote = [row["agent_id"] for row in rows_sorted[:top_k]] if rows_sorted else []
     retire = [row["agent_id"] for row in rows_sorted[-retire_k:]] if retire_k and rows_sorted else []
     allocations = (
@@ -101,7 +165,7 @@ def nightly_eval(
     }
     target_dir = Path(artifacts_dir)
     target_dir.mkdir(parents=True, exist_ok=True)
-    (target_dir / "allocations.json").write_text(json.dumps(out, indent=2))
+    write_json(target_dir / "allocations.json", out)
     return out
 
 
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from collections.abc import Callable, Mapping
+from types import MappingProxyType
 from typing import Any
 
 from ..base import Broker
@@ -7,25 +9,38 @@ from .alpaca import AlpacaBroker, AlpacaClient
 from .sim import SimBroker, SimMarketData
 
 
+def _build_sim(client: AlpacaClient | None = None, **kwargs: Any) -> Broker:
+    return SimBroker(**kwargs)
+
+
+def _build_alpaca(client: AlpacaClient | None = None, **kwargs: Any) -> Broker:
+    if client is None:
+        raise ValueError("Alpaca adapter requires an AlpacaClient instance")
+    return AlpacaBroker(client=client, **kwargs)
+
+
+_REGISTRY: Mapping[str, Callable[..., Broker]] = MappingProxyType(
+    {"sim": _build_sim, "alpaca": _build_alpaca}
+)
+
+
 def build_broker(
     adapter: str,
     *,
     client: AlpacaClient | None = None,
     **kwargs: Any,
 ) -> Broker:
-    if adapter == "sim":
-        return SimBroker(**kwargs)
-    if adapter == "alpaca":
-        if client is None:
-            raise ValueError("Alpaca adapter requires an AlpacaClient instance")
-        return AlpacaBroker(client=client, **kwargs)
-    raise ValueError(f"Unknown live adapter: {adapter}")
+    try:
+        factory = _REGISTRY[adapter]
+    except KeyError:
+        raise ValueError(f"Unknown live adapter: {adapter}") from None
+    return factory(client=client, **kwargs)
 
 
 __all__ = [
     "AlpacaBroker",
     "AlpacaClient",
-    "build_broker",
     "SimBroker",
     "SimMarketData",
+    "build_broker",
 ]
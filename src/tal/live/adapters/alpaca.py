@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from typing import Protocol
+import time
+from collections.abc import Callable
+from typing import Any, Protocol
 
 from ..base import Broker, Fill, Order
 
@@ -22,6 +24,10 @@ class AlpacaClient(Protocol):
 class AlpacaBroker(Broker):
     """Broker implementation backed by an :class:`AlpacaClient` instance."""
 
+    # Account/position/price/clock reads are reused for this many seconds so one
+    # live step (sizing + guardrails) does not repeat the same HTTP calls.
+    read_ttl_s: float = 0.25
+
     def __init__(
         self,
         client: AlpacaClient,
@@ -36,15 +42,16 @@ class AlpacaBroker(Broker):
         self.max_position_pct = max_position_pct
         self.max_daily_loss_pct = max_daily_loss_pct
         self._known_symbols: set[str] = set()
+        self._reads: dict[tuple[str, str], tuple[float, Any]] = {}
 
     # Broker interface -------------------------------------------------
     def cash(self) -> float:
-        account = self.client.get_account()
+        account = self._account()
         cash = account.get("cash", 0.0)
         return float(cash)
 
     def position(self, symbol: str) -> float:
-        qty = self.client.get_position(symbol)
+        qty = self._position(symbol)
         self._known_symbols.add(symbol)
         return float(qty)
 
@@ -59,6 +66,7 @@ class AlpacaBroker(Broker):
         slip = px * (self.slippage_bps / 1e4)
         exec_px = px + slip if side == "buy" else px - slip
         raw_order = self.client.submit_order(symbol=symbol, side=side, qty=qty, type=order.type)
+        self._reads.clear()
         self._known_symbols.add(symbol)
         broker_order_id = None
         status = "submitted"
@@ -76,20 +84,35 @@ class AlpacaBroker(Broker):
 
     # Adapter specific API ---------------------------------------------
     def price(self, symbol: str) -> float:
-        px = self.client.get_last_price(symbol)
+        px = self._read("price", symbol, lambda: self.client.get_last_price(symbol))
         self._known_symbols.add(symbol)
         return float(px)
 
     def positions(self) -> dict[str, float]:
-        return {symbol: float(self.client.get_position(symbol)) for symbol in sorted(self._known_symbols)}
+        return {symbol: float(self._position(symbol)) for symbol in sorted(self._known_symbols)}
 
     def cash_available(self) -> float:
         return self.cash()
 
     def is_market_open(self) -> bool:
-        return bool(self.client.is_market_open())
+        return bool(self._read("clock", "", self.client.is_market_open))
 
     # Helpers ----------------------------------------------------------
+    def _read(self, kind: str, key: str, fetch: Callable[[], Any]) -> Any:
+        now = time.monotonic()
+        hit = self._reads.get((kind, key))
+        if hit is not None and now - hit[0] < self.read_ttl_s:
+            return hit[1]
+        value = fetch()
+        self._reads[(kind, key)] = (now, value)
+        return value
+
+    def _account(self) -> dict:
+        return self._read("account", "", self.client.get_account)
+
+    def _position(self, symbol: str) -> Any:
+        return self._read("position", symbol, lambda: self.client.get_position(symbol))
+
     def _guardrails(self, symbol: str, side: str, qty: float, px: float) -> None:
         if not self.is_market_open():
             raise ValueError("Market is closed")
@@ -98,14 +121,14 @@ class AlpacaBroker(Broker):
             raise ValueError(
                 f"Order value ${notional:0.2f} exceeds max_order_usd ${self.max_order_usd:0.2f}"
             )
-        account = self.client.get_account()
+        account = self._account()
         equity_val = float(account.get("equity", 0.0) or 0.0)
         if (
             self.max_position_pct is not None
             and equity_val > 0
             and side.lower() == "buy"
         ):
-            current_qty = float(self.client.get_position(symbol) or 0.0)
+            current_qty = float(self._position(symbol) or 0.0)
             target_qty = current_qty + qty
             limit = equity_val * (self.max_position_pct / 100.0)
             position_value = abs(target_qty) * px
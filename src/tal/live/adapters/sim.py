@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
 from ..base import Broker, Fill, MarketData, Order
@@ -9,40 +10,48 @@ from ..base import Broker, Fill, MarketData, Order
 
 class SimMarketData(MarketData):
     def __init__(self, series_map: dict[str, pd.Series] | dict[str, list[float]]):
-        self._series: dict[str, pd.Series] = {}
+        # Prices are kept as float64 arrays alongside their (Range)index so the
+        # per-tick latest_price/history calls avoid pandas indexing overhead.
+        self._series: dict[str, np.ndarray] = {}
+        self._index: dict[str, pd.RangeIndex] = {}
         self._cursor: dict[str, int] = {}
         for symbol, values in series_map.items():
             if isinstance(values, pd.Series):
-                ser = values.rename("Close")
+                arr = values.to_numpy(dtype=np.float64)
+                index = values.index if isinstance(values.index, pd.RangeIndex) else None
             else:
-                ser = pd.Series(list(values), name="Close")
-            if not len(ser):
-                ser = pd.Series([100.0], name="Close")
-            if not isinstance(ser.index, pd.RangeIndex):
-                ser = ser.reset_index(drop=True)
-            self._series[symbol] = ser.astype(float)
-            self._cursor[symbol] = len(self._series[symbol]) - 1
+                arr = np.asarray(list(values), dtype=np.float64)
+                index = None
+            if not len(arr):
+                arr = np.array([100.0])
+                index = None
+            self._series[symbol] = arr
+            self._index[symbol] = index if index is not None else pd.RangeIndex(len(arr))
+            self._cursor[symbol] = len(arr) - 1
 
     def latest_price(self, symbol: str) -> float:
-        ser = self._series.get(symbol)
-        if ser is None or ser.empty:
+        arr = self._series.get(symbol)
+        if arr is None or not len(arr):
             return 100.0
-        idx = self._cursor.get(symbol, len(ser) - 1)
-        idx = max(0, min(idx, len(ser) - 1))
+        idx = self._cursor.get(symbol, len(arr) - 1)
+        idx = max(0, min(idx, len(arr) - 1))
         self._cursor[symbol] = idx
-        return float(ser.iloc[idx])
+        return float(arr[idx])
 
     def history(self, symbol: str, bars: int) -> pd.DataFrame:
-        ser = self._series.get(symbol)
-        if ser is None or ser.empty:
-            ser = pd.Series([100.0] * max(1, bars), name="Close")
-        tail = ser.iloc[-bars:] if bars > 0 else ser
-        if bars > 0 and len(tail) < bars:
-            last_val = float(tail.iloc[-1]) if len(tail) else 100.0
-            pad_len = bars - len(tail)
-            pad = pd.Series([last_val] * pad_len, name="Close")
-            tail = pd.concat([pad, tail], ignore_index=True)
-        return tail.rename("Close").to_frame()
+        arr = self._series.get(symbol)
+        if arr is None or not len(arr):
+            arr = np.full(max(1, bars), 100.0)
+            index: pd.Index = pd.RangeIndex(len(arr))
+        else:
+            index = self._index[symbol]
+        if bars <= 0 or len(arr) == bars:
+            return pd.DataFrame({"Close": arr}, index=index)
+        if len(arr) > bars:
+            return pd.DataFrame({"Close": arr[-bars:]}, index=index[-bars:])
+        # Short histories are front-padded with the latest price.
+        padded = np.concatenate((np.full(bars - len(arr), arr[-1]), arr))
+        return pd.DataFrame({"Close": padded})
 
 
 class SimBroker(Broker):
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 import importlib
 import math
 import os
@@ -19,8 +20,11 @@ from tal.achievements import record_trade_notional
 from tal.storage.db import get_engine, record_order, record_run
 
 
+_TRUTHY_VALUES = frozenset({"1", "true", "yes", "y", "on"})
+
+
 def _truthy(value: str | None) -> bool:
-    return str(value).strip().lower() in {"1", "true", "yes", "y", "on"}
+    return str(value).strip().lower() in _TRUTHY_VALUES
 
 
 def _require_real_trading_unlock() -> None:
@@ -58,6 +62,28 @@ class LiveCfg(BaseModel):
         return values
 
 
+@functools.lru_cache(maxsize=256)
+def _validated_live_cfg(items: tuple[tuple[str, type, Any], ...]) -> LiveCfg:
+    return LiveCfg(**{key: value for key, _, value in items})
+
+
+def _live_cfg(raw: Mapping[str, Any]) -> LiveCfg:
+    """Return a validated ``LiveCfg``, reusing the result for identical settings.
+
+    League steps re-validate the same per-agent ``live`` section every tick; each
+    call gets its own copy of the cached model (``model_copy`` skips validation),
+    so one agent's edits never leak into another's settings.
+    """
+
+    try:
+        # The value type is part of the key so that e.g. 1 and True stay distinct.
+        key = tuple((name, type(value), value) for name, value in sorted(raw.items()))
+        cached = _validated_live_cfg(key)
+    except TypeError:  # unhashable values (nested lists/dicts) skip the cache
+        return LiveCfg(**raw)
+    return cached.model_copy()
+
+
 def _ensure_ledger(ledger_dir: Path) -> Path:
     ledger_dir.mkdir(parents=True, exist_ok=True)
     trades_path = ledger_dir / "trades.csv"
@@ -101,7 +127,7 @@ def run_live_once(
     """Execute a single deterministic live trading step."""
 
     ts_start = datetime.now(timezone.utc)
-    live_cfg = LiveCfg(**engine_cfg.get("live", {}))
+    live_cfg = _live_cfg(engine_cfg.get("live", {}))
     ledger_dir = Path(live_cfg.ledger_dir)
     trades_path = _ensure_ledger(ledger_dir)
     universe = engine_cfg.get("universe", {})
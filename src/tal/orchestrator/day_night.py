@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import datetime as dt
 import os
+import re
 import time
 import zoneinfo
 from pathlib import Path
@@ -9,6 +10,11 @@ from typing import Any, Mapping
 
 import yaml
 
+try:  # Prefer the LibYAML-backed loader when PyYAML was built with it.
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # pragma: no cover - pure-Python PyYAML build
+    from yaml import SafeLoader as _YamlLoader  # type: ignore[assignment]
+
 from tal.league.manager import LeagueCfg, live_step_all, nightly_eval
 
 DEFAULT_ENV = {
@@ -20,6 +26,9 @@ DEFAULT_ENV = {
 }
 
 
+_ENV_VAR_RE = re.compile(r"\$\{([A-Za-z_][A-Za-z0-9_]*)\}")
+
+
 def _load_env(env_file: str | None = None) -> None:
     """Load environment variables from a .env-style file with defaults."""
 
@@ -28,23 +37,32 @@ def _load_env(env_file: str | None = None) -> None:
         env_candidate = ".env"
     env_path = Path(env_candidate)
     if env_path.exists():
-        for line in env_path.read_text().splitlines():
-            line = line.strip()
-            if not line or line.startswith("#") or "=" not in line:
-                continue
-            key, value = line.split("=", 1)
-            os.environ.setdefault(key.strip(), value.strip())
+        with env_path.open("r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith("#") or "=" not in line:
+                    continue
+                key, value = line.split("=", 1)
+                os.environ.setdefault(key.strip(), value.strip())
     for key, value in DEFAULT_ENV.items():
         os.environ.setdefault(key, value)
 
 
+def _expand_env(text: str) -> str:
+    """Substitute only the ``${NAME}`` placeholders the text references."""
+
+    names = set(_ENV_VAR_RE.findall(text))
+    if not names:
+        return text
+    env_map = {name: os.environ[name] for name in names if name in os.environ}
+    return _ENV_VAR_RE.sub(lambda m: env_map.get(m.group(1), m.group(0)), text)
+
+
 def _load_cfg(path: str) -> dict[str, Any]:
     _load_env()
     with open(path, "r") as f:
-        raw = f.read()
-    for k, v in os.environ.items():
-        raw = raw.replace("${" + k + "}", v)
-    data = yaml.safe_load(raw)
+        raw = _expand_env(f.read())
+    data = yaml.load(raw, Loader=_YamlLoader)
     if not isinstance(data, dict):
         raise TypeError("Orchestrator config must be a mapping")
     return data
@@ -71,7 +89,11 @@ def _summarize(result: Any) -> str:
 
 
 def run_loop(config_path: str) -> None:
-    cfg = _load_cfg(config_path)
+    run_loop_from_cfg(_load_cfg(config_path))
+
+
+def run_loop_from_cfg(cfg: dict[str, Any]) -> None:
+    _load_env()
     storage_cfg = cfg.get("storage", {})
     db_url = storage_cfg.get("db_url", "sqlite:///./lab.db")
     league_cfg = LeagueCfg(**cfg.get("league", {}))
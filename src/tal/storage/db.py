@@ -2,9 +2,12 @@
 
 from __future__ import annotations
 
+import os
+import threading
+from pathlib import Path
 from typing import Any, Iterable, Mapping, Optional, Sequence, cast
 
-from sqlalchemy import bindparam, create_engine, text
+from sqlalchemy import bindparam, create_engine, make_url, text
 from sqlalchemy.engine import Engine as SAEngine
 
 INIT_STATEMENTS = (
@@ -101,12 +104,45 @@ class Engine:
             return [dict(row) for row in rows]
 
 
-def get_engine(db_url: str) -> SAEngine:
-    """Create an engine for the configured SQLite database and ensure schema."""
+_ENGINES: dict[str, SAEngine] = {}
+_ENGINES_LOCK = threading.Lock()
+
+
+def _sqlite_file_missing(engine: SAEngine) -> bool:
+    url = engine.url
+    database = url.database
+    if url.get_backend_name() != "sqlite" or not database or database == ":memory:":
+        return False
+    return not os.path.exists(database)
+
 
-    engine = create_engine(db_url, echo=False, future=True)
-    init_db(engine)
-    return engine
+def _resolve_db_url(db_url: str) -> str:
+    """Pin relative SQLite paths to the current directory so they survive a chdir."""
+
+    url = make_url(db_url)
+    database = url.database
+    if url.get_backend_name() != "sqlite" or not database or database == ":memory:":
+        return db_url
+    if database.startswith("file:") or url.query.get("uri"):
+        return db_url
+    return url.set(database=str(Path(database).resolve())).render_as_string(hide_password=False)
+
+
+def get_engine(db_url: str) -> SAEngine:
+    """Return a shared engine for ``db_url``, creating it and the schema on first use."""
+
+    db_url = _resolve_db_url(db_url)
+    with _ENGINES_LOCK:
+        engine = _ENGINES.get(db_url)
+        if engine is not None and not _sqlite_file_missing(engine):
+            return engine
+        if engine is not None:
+            # The database file was removed underneath us; start over with a fresh schema.
+            engine.dispose()
+        engine = create_engine(db_url, echo=False, future=True)
+        init_db(engine)
+        _ENGINES[db_url] = engine
+        return engine
 
 
 def init_db(engine: SAEngine) -> None:
@@ -267,6 +303,9 @@ def record_order(engine: SAEngine, order: Mapping[str, Any]) -> None:
         )
 
 
+_IN_CHUNK_SIZE = 900
+
+
 def fetch_runs_since(engine: SAEngine, since_iso: str) -> list[dict[str, object]]:
     """Return runs that started on or after the provided ISO timestamp."""
 
@@ -288,6 +327,54 @@ def fetch_metrics_for_runs(engine: SAEngine, run_ids: Sequence[str]) -> list[dic
         text("SELECT run_id, name, value FROM metrics WHERE run_id IN :run_ids")
         .bindparams(bindparam("run_ids", expanding=True))
     )
+    ids = tuple(run_ids)
+    out: list[dict[str, object]] = []
+    # Chunk the IN list to stay under SQLite's bound-parameter limit; one connection
+    # serves every chunk.
     with engine.connect() as conn:
-        rows = conn.execute(stmt, {"run_ids": tuple(run_ids)}).mappings()
+        for offset in range(0, len(ids), _IN_CHUNK_SIZE):
+            chunk = ids[offset : offset + _IN_CHUNK_SIZE]
+            out.extend(dict(row) for row in conn.execute(stmt, {"run_ids": chunk}).mappings())
+    return out
+
+
+def fetch_metrics_since(
+    engine: SAEngine, since_iso: str, names: Sequence[str] | None = None
+) -> list[dict[str, object]]:
+    """Return metric rows for runs that started on or after ``since_iso``.
+
+    Runs and metrics are joined in one query; ``names`` optionally limits the metrics.
+    """
+
+    sql = (
+        "SELECT m.run_id, m.name, m.value FROM metrics m "
+        "JOIN runs r ON m.run_id = r.id WHERE r.ts_start >= :since"
+    )
+    params: dict[str, object] = {"since": since_iso}
+    if names is not None:
+        if not names:
+            return []
+        stmt = text(sql + " AND m.name IN :names").bindparams(bindparam("names", expanding=True))
+        params["names"] = tuple(names)
+    else:
+        stmt = text(sql)
+    with engine.connect() as conn:
+        rows = conn.execute(stmt, params).mappings()
         return [dict(row) for row in rows]
+
+
+def fetch_metric_sum_since(engine: SAEngine, since_iso: str, name: str) -> float:
+    """Return the sum of one metric over runs that started on or after ``since_iso``."""
+
+    with engine.connect() as conn:
+        total = conn.execute(
+            text(
+                """
+                SELECT COALESCE(SUM(m.value), 0.0)
+                FROM metrics m JOIN runs r ON m.run_id = r.id
+                WHERE m.name = :name AND r.ts_start >= :since
+                """
+            ),
+            {"name": name, "since": since_iso},
+        ).scalar()
+    return float(total or 0.0)
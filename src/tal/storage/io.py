@@ -2,9 +2,67 @@
 
 from __future__ import annotations
 
+import json
+import math
 from pathlib import Path
+from typing import Any
+
+try:  # Optional C-accelerated JSON encoder; stdlib json is the fallback.
+    import orjson
+except ImportError:  # pragma: no cover - exercised when the extra is absent
+    orjson = None  # type: ignore[assignment]
+
 
 def ensure_dir(path: str | Path) -> Path:
     p = Path(path)
     p.mkdir(parents=True, exist_ok=True)
     return p
+
+
+def _json_safe(obj: Any) -> Any:
+    """Map ``obj`` onto what orjson emits: NumPy values as Python ones, NaN/Inf as null."""
+
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {key: _json_safe(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_json_safe(value) for value in obj]
+    # NumPy scalars and arrays, detected without importing numpy here.
+    if type(obj).__module__ == "numpy" and hasattr(obj, "tolist"):
+        return _json_safe(obj.tolist())
+    return obj
+
+
+def dumps_json(obj: Any, *, indent: bool = True, sort_keys: bool = False) -> bytes:
+    """Serialize ``obj`` to UTF-8 JSON bytes (two-space indent unless ``indent`` is false).
+
+    orjson is used when installed; the stdlib fallback produces the same document:
+    NaN/Inf become ``null``, NumPy scalars/arrays are serialized natively and
+    non-ASCII text is written as raw UTF-8.
+    """
+
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(obj, option=option)
+        except TypeError:  # types orjson rejects (e.g. non-str keys); use the stdlib encoder
+            pass
+    return json.dumps(
+        _json_safe(obj),
+        indent=2 if indent else None,
+        separators=(",", ": ") if indent else (",", ":"),
+        sort_keys=sort_keys,
+        ensure_ascii=False,
+        allow_nan=False,
+    ).encode("utf-8")
+
+
+def write_json(path: str | Path, obj: Any, *, sort_keys: bool = False) -> None:
+    """Write ``obj`` as indented JSON without materializing an intermediate str."""
+
+    Path(path).write_bytes(dumps_json(obj, sort_keys=sort_keys))
@@ -1,7 +1,14 @@
+import math
+
 import pandas as pd
 import numpy as np
 from tal.strategies.base import Strategy
 
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - numba is an optional extra
+    njit = None  # type: ignore[assignment, unused-ignore]
+
 def _rsi(close: pd.Series, n: int) -> pd.Series:
     delta = close.diff()
     up = delta.clip(lower=0)
@@ -10,6 +17,54 @@ def _rsi(close: pd.Series, n: int) -> pd.Series:
     rsi = 100 - (100 / (1 + rs))
     return rsi.bfill().fillna(50)
 
+def _rolling_mean_loop(values: np.ndarray, n: int) -> np.ndarray:
+    """Trailing ``n``-point mean from cumulative sums; NaN until the window is full or holds a NaN."""
+
+    size = values.shape[0]
+    out = np.full(size, np.nan)
+    if n > size:
+        return out
+    missing = np.isnan(values)
+    csum = np.concatenate((np.zeros(1), np.cumsum(np.where(missing, 0.0, values))))
+    cnan = np.concatenate((np.zeros(1, dtype=np.int64), np.cumsum(missing.astype(np.int64))))
+    window = (csum[n:] - csum[:-n]) / n
+    out[n - 1 :] = np.where(cnan[n:] - cnan[:-n] == 0, window, np.nan)
+    return out
+
+def _rsi_loop(close: np.ndarray, n: int) -> np.ndarray:
+    """NumPy counterpart of ``_rsi`` (rolling means agree with pandas up to float rounding)."""
+
+    size = close.shape[0]
+    delta = np.full(size, np.nan)
+    delta[1:] = close[1:] - close[:-1]
+    # clip(lower=0) / -clip(upper=0); NaN deltas stay NaN.
+    up = np.where(delta < 0.0, 0.0, delta)
+    down = np.where(delta > 0.0, 0.0, -delta)
+    up_mean = _rolling_mean_loop(up, n)
+    down_mean = _rolling_mean_loop(down, n)
+    # replace(0, nan): count losses exactly so cumsum residues cannot fake a nonzero mean.
+    has_loss = _rolling_mean_loop(np.where(down > 0.0, 1.0, 0.0), n) > 0.0
+    rs = up_mean / np.where(has_loss, down_mean, np.nan)
+    rsi = 100.0 - 100.0 / (1.0 + rs)
+    # bfill, then 50 for trailing gaps.
+    nxt = 50.0
+    for i in range(size - 1, -1, -1):
+        if np.isnan(rsi[i]):
+            rsi[i] = nxt
+        else:
+            nxt = rsi[i]
+    return rsi
+
+def _rsi_signal_loop(close: np.ndarray, n: int, overbought: float) -> np.ndarray:
+    """RSI + signal kernel mirroring ``_rsi``; compiled with numba when it is installed."""
+
+    return np.where(_rsi_loop(close, n) <= overbought, 1, -1).astype(np.int64)
+
+if njit is not None:
+    _rolling_mean_loop = njit(cache=True)(_rolling_mean_loop)
+    _rsi_loop = njit(cache=True)(_rsi_loop)
+_rsi_signal_kernel = njit(cache=True)(_rsi_signal_loop) if njit is not None else None
+
 class RSIMeanReversion(Strategy):
     def __init__(self, rsi_len=14, oversold=30, overbought=70):
         self.rsi_len = rsi_len
@@ -17,6 +72,10 @@ class RSIMeanReversion(Strategy):
         self.overbought = overbought
 
     def generate_signals(self, df: pd.DataFrame) -> pd.Series:
+        if _rsi_signal_kernel is not None and int(self.rsi_len) >= 1 and not math.isnan(float(self.overbought)):
+            close = df["Close"].to_numpy(dtype=np.float64)
+            sig_arr = _rsi_signal_kernel(close, int(self.rsi_len), float(self.overbought))
+            return pd.Series(sig_arr, index=df.index)
         rsi = _rsi(df["Close"], self.rsi_len)
         long_sig = (rsi <= self.overbought).astype(int)
         short_sig = (rsi > self.overbought).astype(int) * -1
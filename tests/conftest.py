@@ -1,5 +1,12 @@
 import pandas as pd
 import numpy as np
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _isolated_data_cache(monkeypatch, tmp_path):
+    # Keep cached market data per-test so mocked downloads never leak between tests.
+    monkeypatch.setenv("TAL_DATA_CACHE", str(tmp_path / "ycache"))
 
 
 def make_price_df(n=60, start=100.0, step=0.5, up_only=False):
@@ -37,8 +37,8 @@ def test_render_badges_line_reflects_unlocks(monkeypatch, badge_setup):
     unlocked_key = "paper_first_$1_trade"
     monkeypatch.setattr(
         achievements_badges.achievements,
-        "is_unlocked",
-        lambda key: key == unlocked_key,
+        "unlocked_keys",
+        lambda: {unlocked_key},
     )
 
     line = achievements_badges.render_badges_line(style="flat", label_case="title")
@@ -50,8 +50,8 @@ def test_render_badges_line_reflects_unlocks(monkeypatch, badge_setup):
 def test_update_readme_between_markers(tmp_path, badge_setup, monkeypatch):
     monkeypatch.setattr(
         achievements_badges.achievements,
-        "is_unlocked",
-        lambda key: False,
+        "unlocked_keys",
+        lambda: set(),
     )
     badges_line = achievements_badges.render_badges_line()
     readme = tmp_path / "README.md"
@@ -71,8 +71,8 @@ def test_update_readme_between_markers(tmp_path, badge_setup, monkeypatch):
 def test_cli_badges_stdout(monkeypatch, badge_setup):
     monkeypatch.setattr(
         achievements_badges.achievements,
-        "is_unlocked",
-        lambda key: False,
+        "unlocked_keys",
+        lambda: set(),
     )
     expected_line = achievements_badges.render_badges_line()
 
@@ -83,3 +83,14 @@ def test_cli_badges_stdout(monkeypatch, badge_setup):
     assert result.output.strip() == expected_line
     for token in expected_line.split():
         assert token in result.output
+
+
+def test_parse_badge_key_rejects_unknown_formats():
+    assert achievements_badges._parse_badge_key("real_first_$420_profit") == (
+        "real",
+        "420",
+        "profit",
+    )
+    for key in ("paper_first_$1_swap", "demo_first_$1_trade", "paper_$1_trade"):
+        with pytest.raises(achievements_badges.BadgeKeyError):
+            achievements_badges._parse_badge_key(key)
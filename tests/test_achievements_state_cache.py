@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import json
+
+from tal import achievements
+from tal.achievements import (
+    force_flush,
+    is_unlocked,
+    list_achievements,
+    record_trade_notional,
+    reset_achievements,
+)
+
+
+def test_state_cache_skips_reparse_and_tracks_external_writes(monkeypatch, tmp_path):
+    achievements_dir = tmp_path / "achievements"
+    monkeypatch.setenv("ACHIEVEMENTS_DIR", str(achievements_dir))
+    monkeypatch.setenv("ACHIEVEMENTS_ENABLED", "1")
+    reset_achievements()
+
+    record_trade_notional(1.5, "paper")
+    force_flush()
+
+    calls = []
+    real_loads = json.loads
+
+    def counting_loads(*args, **kwargs):
+        calls.append(args)
+        return real_loads(*args, **kwargs)
+
+    monkeypatch.setattr(achievements.json, "loads", counting_loads)
+    assert is_unlocked("paper_first_$1_trade")
+    assert not is_unlocked("paper_first_$10_trade")
+    assert calls == []
+
+    state_path = achievements_dir / "state.json"
+    state = real_loads(state_path.read_text())
+    state["achievements"]["paper_first_$10_trade"] = {"key": "paper_first_$10_trade"}
+    state_path.write_text(json.dumps(state, indent=4))
+
+    assert is_unlocked("paper_first_$10_trade")
+    assert len(calls) == 1
+
+
+def test_state_writes_are_coalesced_until_flush(monkeypatch, tmp_path):
+    achievements_dir = tmp_path / "achievements"
+    monkeypatch.setenv("ACHIEVEMENTS_DIR", str(achievements_dir))
+    monkeypatch.setenv("ACHIEVEMENTS_ENABLED", "1")
+    monkeypatch.setattr(achievements, "_FLUSH_DELAY_SECONDS", 60.0)
+    reset_achievements()
+
+    record_trade_notional(1.5, "paper")
+    record_trade_notional(1.5, "real")
+
+    state_path = achievements_dir / "state.json"
+    assert not state_path.exists()
+    assert set(list_achievements()["achievements"]) == {
+        "paper_first_$1_trade",
+        "real_first_$1_trade",
+    }
+
+    force_flush()
+
+    on_disk = json.loads(state_path.read_text())
+    assert set(on_disk["achievements"]) == {"paper_first_$1_trade", "real_first_$1_trade"}
+    assert not (achievements_dir / "state.json.tmp").exists()
+
+
+def test_failed_background_flush_keeps_state_staged(monkeypatch, tmp_path):
+    achievements_dir = tmp_path / "achievements"
+    monkeypatch.setenv("ACHIEVEMENTS_DIR", str(achievements_dir))
+    monkeypatch.setenv("ACHIEVEMENTS_ENABLED", "1")
+    monkeypatch.setattr(achievements, "_FLUSH_DELAY_SECONDS", 60.0)
+    reset_achievements()
+    record_trade_notional(1.5, "paper")
+
+    real_write_json = achievements.write_json
+    failures: list[str] = []
+
+    def flaky_write_json(path, obj, **kwargs):
+        if str(path).endswith("state.json.tmp") and not failures:
+            failures.append(str(path))
+            raise OSError("disk full")
+        real_write_json(path, obj, **kwargs)
+
+    monkeypatch.setattr(achievements, "write_json", flaky_write_json)
+    achievements._flush_from_timer()
+
+    state_path = achievements_dir / "state.json"
+    assert failures and not state_path.exists()
+    assert is_unlocked("paper_first_$1_trade")
+
+    force_flush()
+
+    assert "paper_first_$1_trade" in json.loads(state_path.read_text())["achievements"]
@@ -20,3 +20,37 @@ def test_trade_notional_unlock(monkeypatch, tmp_path):
 
     state = list_achievements()
     assert "paper_first_$1_trade" in state.get("achievements", {})
+
+
+def test_trade_notional_batches_multiple_unlocks(monkeypatch, tmp_path):
+    achievements_dir = tmp_path / "achievements"
+    monkeypatch.setenv("ACHIEVEMENTS_DIR", str(achievements_dir))
+    monkeypatch.setenv("ACHIEVEMENTS_ENABLED", "1")
+    reset_achievements()
+
+    unlocked = record_trade_notional(150.0, "paper")
+    assert unlocked == [
+        "paper_first_$1_trade",
+        "paper_first_$10_trade",
+        "paper_first_$69_trade",
+        "paper_first_$100_trade",
+    ]
+    log_lines = (achievements_dir / "log.ndjson").read_text().splitlines()
+    assert len(log_lines) == len(unlocked)
+    assert len(list((achievements_dir / "badges").glob("*.json"))) == len(unlocked)
+
+    assert record_trade_notional(150.0, "paper") == []
+
+
+def test_log_is_recreated_after_external_delete(monkeypatch, tmp_path):
+    achievements_dir = tmp_path / "achievements"
+    monkeypatch.setenv("ACHIEVEMENTS_DIR", str(achievements_dir))
+    monkeypatch.setenv("ACHIEVEMENTS_ENABLED", "1")
+    reset_achievements()
+
+    record_trade_notional(1.5, "paper")
+    log_path = achievements_dir / "log.ndjson"
+    log_path.unlink()
+
+    assert record_trade_notional(12.0, "paper") == ["paper_first_$10_trade"]
+    assert '"paper_first_$10_trade"' in log_path.read_text()
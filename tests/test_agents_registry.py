@@ -19,7 +19,7 @@ def test_spec_load_and_translate(tmp_path):
 
 
 def test_agent_backtests_with_two_configs(monkeypatch, tmp_path):
-    def fake_download(symbol, period="max", interval="1d", auto_adjust=True):
+    def fake_download(symbol, **kwargs):
         return make_price_df(n=120)
 
     monkeypatch.setattr(engine, "yf", types.SimpleNamespace(download=fake_download))
@@ -47,3 +47,48 @@ def test_agent_backtests_with_two_configs(monkeypatch, tmp_path):
     rows = json.loads(result.stdout)
     ids = {row.get("agent_id", "default") for row in rows}
     assert {"codex_seed", "rsi_v2"}.issubset(ids)
+
+
+def test_spec_default_sections_match_validated_defaults():
+    from tal.agents.spec import AgentSpec, DataCfg, LiveCfg, OrchestratorCfg
+
+    a = AgentSpec.model_validate({"id": "a", "components": {"strategy": "rsi_mean_rev"}})
+    b = AgentSpec.model_validate({"id": "b", "components": {"strategy": "rsi_mean_rev"}})
+    assert a.data == DataCfg()
+    assert a.live.model_dump() == LiveCfg().model_dump()
+    assert a.orchestrator.model_dump() == OrchestratorCfg().model_dump()
+    assert a.data is not b.data
+    assert a.evaluation.kpis is not b.evaluation.kpis
+
+
+def test_spec_default_strategy_is_not_shared():
+    from tal.agents.spec import AgentSpec
+
+    a = AgentSpec.model_validate({"id": "a", "components": {"strategy": "rsi_mean_rev"}})
+    b = AgentSpec.model_validate({"id": "b", "components": {"strategy": "rsi_mean_rev"}})
+    a.strategy["params"]["rsi_len"] = 2
+    assert b.strategy["params"]["rsi_len"] == 14
+
+
+def test_spec_from_mapping_matches_file_loader():
+    import yaml
+
+    from tal.agents.registry import agent_spec_from_mapping
+
+    raw = yaml.safe_load(Path("config/agents/codex_seed.yaml").read_text())
+    assert agent_spec_from_mapping(raw) == load_agent_config("config/agents/codex_seed.yaml")
+
+
+def test_load_agent_config_reuses_parsed_yaml(tmp_path):
+    from tal.agents import registry
+
+    cfg = tmp_path / "agent.yaml"
+    cfg.write_text(Path("config/agents/codex_seed.yaml").read_text())
+    registry._parse_agent_text.cache_clear()
+
+    first = load_agent_config(str(cfg))
+    first.strategy["params"]["rsi_len"] = 99
+    second = load_agent_config(str(cfg))
+
+    assert registry._parse_agent_text.cache_info().hits == 1
+    assert second.strategy["params"]["rsi_len"] != 99
@@ -135,3 +135,23 @@ live:
     )
     assert called, "alpaca_client_factory should be invoked"
     assert results and results[0]["agent_id"] == "test_agent"
+
+
+def test_alpaca_broker_reuses_reads_until_submit() -> None:
+    client = FakeClient()
+    calls: list[str] = []
+    get_account = client.get_account
+
+    def counting_get_account() -> dict:
+        calls.append("account")
+        return get_account()
+
+    client.get_account = counting_get_account  # type: ignore[method-assign]
+    broker = AlpacaBroker(client, max_position_pct=50.0)
+
+    cash_before = broker.cash()
+    broker.submit(Order("SPY", "buy", qty=2.0, ref_price=50.0))
+    assert calls == ["account"]
+    assert broker.position("SPY") == 2.0
+    assert broker.cash() == cash_before - 100.0
+    assert calls == ["account", "account"]
@@ -1,6 +1,10 @@
+import os
 import types
 from pathlib import Path
 
+import numpy as np
+import pandas as pd
+
 import tal.backtest.engine as engine
 from typer.testing import CliRunner
 
@@ -10,7 +14,7 @@ from tests.conftest import make_price_df
 
 def test_backtest_cli_with_mocked_data(monkeypatch, tmp_path):
     # Mock yfinance.download to avoid network
-    def fake_download(symbol, period="max", interval="1d", auto_adjust=True):
+    def fake_download(symbol, **kwargs):
         return make_price_df(n=120)
 
     monkeypatch.setattr(engine, "yf", types.SimpleNamespace(download=fake_download))
@@ -28,3 +32,136 @@ def test_backtest_cli_with_mocked_data(monkeypatch, tmp_path):
     result = runner.invoke(app, ["backtest", "--config", str(cfg_out)])
     assert result.exit_code == 0
     assert "[BACKTEST]" in result.stdout
+
+
+def test_pnl_from_signals_matches_pandas_reference():
+    df = make_price_df(n=50)
+    sig = pd.Series(np.where(np.arange(50) % 7 < 4, 1, -1), index=df.index)
+
+    res = engine._pnl_from_signals(df, sig, size_pct=25.0)
+
+    ret = df["Close"].pct_change().fillna(0.0)
+    expected_ret = sig.shift(1).fillna(0.0) * 0.25 * ret
+    assert res.index.equals(df.index)
+    assert np.allclose(res["ret"], expected_ret)
+    assert np.allclose(res["eq"], (1.0 + expected_ret).cumprod())
+
+
+def test_pnl_loop_matches_vectorized_path(monkeypatch):
+    df = make_price_df(n=50)
+    sig = pd.Series(np.where(np.arange(50) % 5 < 2, 1, 0), index=df.index)
+    monkeypatch.setattr(engine, "_pnl_kernel", None)
+    expected = engine._pnl_from_signals(df, sig, size_pct=10.0)
+
+    ret, eq = engine._pnl_loop(
+        df["Close"].to_numpy(dtype=np.float64), sig.to_numpy(dtype=np.float64), 0.1
+    )
+
+    assert np.allclose(ret, expected["ret"])
+    assert np.allclose(eq, expected["eq"])
+
+
+def test_load_config_reuses_parsed_yaml(monkeypatch, tmp_path):
+    cfg_path = tmp_path / "cfg.yaml"
+    cfg_path.write_text("storage:\n  db_url: ${TAL_TEST_DB_URL}\n")
+    monkeypatch.setenv("TAL_TEST_DB_URL", "sqlite:///one.db")
+    engine._parse_config_text.cache_clear()
+
+    first, _ = engine.load_config(str(cfg_path))
+    first["storage"]["db_url"] = "mutated"
+    second, _ = engine.load_config(str(cfg_path))
+    assert second["storage"]["db_url"] == "sqlite:///one.db"
+    assert engine._parse_config_text.cache_info().hits == 1
+
+    monkeypatch.setenv("TAL_TEST_DB_URL", "sqlite:///two.db")
+    third, _ = engine.load_config(str(cfg_path))
+    assert third["storage"]["db_url"] == "sqlite:///two.db"
+
+
+def test_expand_env_only_touches_identifier_placeholders(monkeypatch):
+    monkeypatch.setenv("TAL_TEST_SYMBOL", "SPY")
+    monkeypatch.delenv("TAL_TEST_MISSING", raising=False)
+    text = "a: ${TAL_TEST_SYMBOL}\nb: ${TAL_TEST_MISSING}\nc: ${not a var}\nd: $5\n"
+    assert engine._expand_env(text) == (
+        "a: SPY\nb: ${TAL_TEST_MISSING}\nc: ${not a var}\nd: $5\n"
+    )
+
+
+def test_load_env_reuses_parsed_file_until_it_changes(monkeypatch, tmp_path):
+    env_file = tmp_path / ".env"
+    env_file.write_text("TAL_TEST_ENV_A=one\n# comment\n")
+    monkeypatch.delenv("TAL_TEST_ENV_A", raising=False)
+    monkeypatch.delenv("TAL_TEST_ENV_B", raising=False)
+    engine._ENV_CACHE.clear()
+
+    engine._load_env(str(env_file))
+    first = engine._ENV_CACHE[str(env_file.resolve())]
+    engine._load_env(str(env_file))
+    assert engine._ENV_CACHE[str(env_file.resolve())] is first
+    assert os.environ["TAL_TEST_ENV_A"] == "one"
+
+    env_file.write_text("TAL_TEST_ENV_B=two\n")
+    os.utime(env_file, ns=(0, first[0] + 1_000_000))
+    engine._load_env(str(env_file))
+    assert os.environ["TAL_TEST_ENV_B"] == "two"
+
+
+def test_load_data_caches_downloads_on_disk(monkeypatch, tmp_path):
+    calls = []
+
+    def fake_download(symbol, **kwargs):
+        calls.append(symbol)
+        return make_price_df(n=30)
+
+    monkeypatch.setattr(engine, "yf", types.SimpleNamespace(download=fake_download))
+
+    first = engine._load_data("SPY", 20, "1d")
+    second = engine._load_data("SPY", 20, "1d")
+
+    assert calls == ["SPY"]
+    assert len(first) == 20
+    # CSV does not carry the index freq (yfinance frames have none anyway).
+    pd.testing.assert_frame_equal(first, second, check_freq=False)
+    assert list((tmp_path / "ycache").glob("SPY_1d_*.csv"))
+
+
+def test_download_history_drops_stale_cache_entries(monkeypatch, tmp_path):
+    monkeypatch.setattr(
+        engine, "yf", types.SimpleNamespace(download=lambda *a, **k: make_price_df(n=10))
+    )
+    cache_dir = tmp_path / "ycache"
+    cache_dir.mkdir()
+    stale = cache_dir / "SPY_1d_2000-01-01_max.csv"
+    make_price_df(n=5).to_csv(stale)
+    legacy = cache_dir / "SPY_1d_2000-01-01.pkl"
+    legacy.write_bytes(b"not loaded")
+    other = cache_dir / "QQQ_1d_2000-01-01_max.csv"
+    make_price_df(n=5).to_csv(other)
+
+    df = engine._download_history("SPY", "1d")
+
+    assert len(df) == 10
+    assert not stale.exists()
+    assert not legacy.exists()
+    assert other.exists()
+
+
+def test_load_data_requests_only_the_lookback_window(monkeypatch):
+    calls = []
+
+    def fake_download(symbol, **kwargs):
+        calls.append(kwargs)
+        return make_price_df(n=300)
+
+    monkeypatch.setattr(engine, "yf", types.SimpleNamespace(download=fake_download))
+
+    assert len(engine._load_data("SPY", 100, "1d")) == 100
+    assert "period" not in calls[0]
+    narrow_start = calls[0]["start"]
+
+    engine._load_data("SPY", 50, "1d")
+    assert len(calls) == 1  # a shorter window is served from the cache
+
+    engine._load_data("SPY", 200, "1d")
+    assert len(calls) == 2
+    assert calls[1]["start"] < narrow_start
@@ -1,6 +1,16 @@
 import os
+import subprocess
 import sys
 
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _clear_dotenv_sentinel(monkeypatch):
+    # setenv first so monkeypatch removes whatever the import under test records.
+    monkeypatch.setenv("TAL_DOTENV_LOADED", "")
+    monkeypatch.delenv("TAL_DOTENV_LOADED")
+
 
 def test_cli_autoloads_dotenv(monkeypatch, tmp_path):
     env_dir = tmp_path
@@ -26,3 +36,47 @@ def test_cli_does_not_override_existing_env(monkeypatch, tmp_path):
     import tal.cli  # noqa: F401  # pylint: disable=unused-import
 
     assert os.getenv("WILL_NOT_OVERRIDE") == "no"
+
+
+def test_cli_skips_dotenv_when_requested(monkeypatch, tmp_path):
+    (tmp_path / ".env").write_text("SKIPPED_DOTENV_VAR=yes\n")
+    monkeypatch.delenv("SKIPPED_DOTENV_VAR", raising=False)
+    monkeypatch.setenv("TAL_SKIP_DOTENV", "1")
+    monkeypatch.chdir(tmp_path)
+    sys.modules.pop("tal.cli", None)
+
+    import tal.cli  # noqa: F401  # pylint: disable=unused-import
+
+    assert os.getenv("SKIPPED_DOTENV_VAR") is None
+
+
+def test_cli_reimport_does_not_reparse_dotenv(monkeypatch, tmp_path):
+    (tmp_path / ".env").write_text("RELOADED_DOTENV_VAR=yes\n")
+    monkeypatch.delenv("RELOADED_DOTENV_VAR", raising=False)
+    monkeypatch.chdir(tmp_path)
+    sys.modules.pop("tal.cli", None)
+
+    import tal.cli  # pylint: disable=unused-import
+
+    assert os.getenv("RELOADED_DOTENV_VAR") == "yes"
+    assert os.getenv("TAL_DOTENV_LOADED") == os.getcwd()
+    monkeypatch.delenv("RELOADED_DOTENV_VAR")
+    sys.modules.pop("tal.cli", None)
+
+    import tal.cli  # noqa: F401,F811  # pylint: disable=unused-import,reimported
+
+    assert os.getenv("RELOADED_DOTENV_VAR") is None
+
+
+@pytest.mark.parametrize(("sentinel", "expected"), [("same", "None"), ("other", "yes")])
+def test_cli_subprocess_honours_dotenv_sentinel(tmp_path, sentinel, expected):
+    (tmp_path / ".env").write_text("CHILD_DOTENV_VAR=yes\n")
+    env = {k: v for k, v in os.environ.items() if k not in {"CHILD_DOTENV_VAR", "TAL_SKIP_DOTENV"}}
+    env["TAL_DOTENV_LOADED"] = str(tmp_path) if sentinel == "same" else str(tmp_path / "elsewhere")
+    code = "import os, tal.cli; print(os.getenv('CHILD_DOTENV_VAR'))"
+
+    out = subprocess.run(
+        [sys.executable, "-c", code], cwd=tmp_path, env=env, capture_output=True, text=True, check=True
+    )
+
+    assert out.stdout.strip() == expected
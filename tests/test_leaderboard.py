@@ -2,6 +2,10 @@ from __future__ import annotations
 
 from datetime import datetime, timedelta, timezone
 
+import numpy as np
+import pandas as pd
+import pytest
+
 from tal.evaluation.leaderboard import (
     build_leaderboard,
     format_json,
@@ -58,3 +62,34 @@ def test_leaderboard_single_run(tmp_path):
     assert builder_rows and builder_rows[0]["runs"] == 1
     builder_table = format_table(builder_rows, group="builder")
     assert "builder" in builder_table.lower()
+
+
+def test_print_table_formats_missing_and_numeric_cells():
+    from tal.evaluation.leaderboard import print_table
+
+    rows = [
+        {"agent_id": "a", "builder_name": None, "runs": 2, "profit_factor": float("nan"),
+         "sharpe": 1.23456, "max_dd": pd.NA, "win_rate": np.float32(0.5)},
+    ]
+    body = print_table(rows).splitlines()[-1]
+
+    assert [cell.strip() for cell in body.split("|")] == ["a", "-", "2", "-", "1.2346", "-", "0.5000"]
+
+
+def test_format_json_writes_missing_metrics_as_null(monkeypatch):
+    import json
+
+    from tal.storage import io
+
+    rows = [{"agent_id": "a", "runs": 1, "profit_factor": float("nan"), "sharpe": np.float64("nan")}]
+
+    def strict(text):
+        return json.loads(text, parse_constant=lambda name: pytest.fail(f"non-standard {name}"))
+
+    outputs = [format_json(rows), format_json(pd.DataFrame(rows))]
+    monkeypatch.setattr(io, "orjson", None)
+    outputs += [format_json(rows), format_json(pd.DataFrame(rows))]
+
+    for text in outputs:
+        assert strict(text)[0]["profit_factor"] is None
+        assert strict(text)[0]["sharpe"] is None
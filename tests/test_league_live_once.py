@@ -1,6 +1,6 @@
 from pathlib import Path
 
-from tal.league.manager import live_step_all
+from tal.league.manager import list_agent_files, live_step_all
 
 
 def test_league_live_writes_per_agent_ledgers(tmp_path):
@@ -23,3 +23,80 @@ def test_league_live_writes_per_agent_ledgers(tmp_path):
         ledger = tmp_path / "artifacts/league/live" / row["agent_id"] / "trades.csv"
         assert ledger.exists()
     assert (tmp_path / "artifacts/league/last_live.json").exists()
+
+
+def test_list_agent_files_tracks_directory_changes(tmp_path):
+    agents = tmp_path / "agents"
+    agents.mkdir()
+    (agents / "b.yaml").write_text("id: b\n")
+    (agents / "a.yaml").write_text("id: a\n")
+    (agents / "notes.txt").write_text("skip\n")
+
+    assert list_agent_files(str(agents)) == [str(agents / "a.yaml"), str(agents / "b.yaml")]
+
+    (agents / "a.yaml").unlink()
+    assert list_agent_files(str(agents)) == [str(agents / "b.yaml")]
+    assert list_agent_files(str(tmp_path / "missing")) == []
+
+
+def test_league_live_steps_agents_in_file_order(tmp_path):
+    agents = tmp_path / "agents"
+    agents.mkdir()
+    for agent_id in ("c_agent", "a_agent", "b_agent"):
+        (agents / f"{agent_id}.yaml").write_text(
+            f"id: {agent_id}\ncomponents:\n  strategy: rsi_mean_rev\nlive:\n  adapter: sim\n"
+        )
+
+    results = live_step_all(
+        f"sqlite:///{(tmp_path / 'lab.db').as_posix()}",
+        str(agents),
+        str(tmp_path / "artifacts/league"),
+    )
+
+    assert [row["agent_id"] for row in results] == ["a_agent", "b_agent", "c_agent"]
+    for agent_id in ("a_agent", "b_agent", "c_agent"):
+        assert (tmp_path / f"artifacts/league/live/{agent_id}/trades.csv").exists()
+
+
+def test_league_live_steps_alpaca_agents_one_at_a_time(tmp_path, monkeypatch):
+    import threading
+
+    from tal.league import manager
+
+    agents = tmp_path / "agents"
+    agents.mkdir()
+    specs = (("a1", "alpaca"), ("a2", "alpaca"), ("s1", "sim"), ("s2", "sim"), ("s4", "sim"))
+    for name, adapter in specs:
+        (agents / f"{name}.yaml").write_text(
+            f"id: {name}\ncomponents:\n  strategy: rsi_mean_rev\nlive:\n  adapter: {adapter}\n"
+        )
+    (agents / "s3.yaml").write_text("id: s1\ncomponents:\n  strategy: rsi_mean_rev\n")
+    lock = threading.Lock()
+    active: list[str] = []
+    overlaps: list[tuple[str, ...]] = []
+    order: list[str] = []
+    peak = [0]
+
+    def fake_run_live_once(cfg, alpaca_client=None):
+        agent_id = cfg["agent"]["id"]
+        adapter = cfg["live"].get("adapter", "sim")
+        with lock:
+            if adapter == "alpaca" or agent_id == "s1":
+                order.append(f"{agent_id}:{adapter}")
+            if active and (adapter == "alpaca" or any(a.startswith(("a", "s1")) for a in active)):
+                overlaps.append((agent_id, *active))
+            active.append(agent_id)
+            peak[0] = max(peak[0], len(active))
+        threading.Event().wait(0.02)
+        with lock:
+            active.remove(agent_id)
+        return {"adapter": adapter}
+
+    monkeypatch.setattr(manager, "run_live_once", fake_run_live_once)
+
+    results = manager.live_step_all("", str(agents), str(tmp_path / "artifacts"))
+
+    assert [row["agent_id"] for row in results] == ["a1", "a2", "s1", "s2", "s1", "s4"]
+    assert order == ["a1:alpaca", "a2:alpaca", "s1:sim", "s1:sim"]
+    assert overlaps == []
+    assert peak[0] == 2  # s2 and s4 still run concurrently
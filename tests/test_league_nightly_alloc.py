@@ -9,7 +9,7 @@ from tests.conftest import make_price_df
 
 
 def test_nightly_eval_allocates(monkeypatch, tmp_path):
-    def fake_download(symbol, period="max", interval="1d", auto_adjust=True):
+    def fake_download(symbol, **kwargs):
         return make_price_df(n=180)
 
     monkeypatch.setattr(engine, "yf", types.SimpleNamespace(download=fake_download))
@@ -36,3 +36,50 @@ def test_nightly_eval_allocates(monkeypatch, tmp_path):
     assert result["promote"]
     assert isinstance(result["allocations"], dict)
     assert (tmp_path / "artifacts/league/allocations.json").exists()
+
+
+def test_rank_rows_matches_tuple_sort_and_ranks_missing_last():
+    from tal.league.manager import _rank_rows
+
+    rows = [
+        {"agent_id": "a", "sharpe": 1.0, "profit_factor": 2.0},
+        {"agent_id": "b", "sharpe": None, "profit_factor": 9.0},
+        {"agent_id": "c", "sharpe": 1.0, "profit_factor": 3.0},
+        {"agent_id": "d", "sharpe": 1.0, "profit_factor": 2.0},
+        {"agent_id": "e", "sharpe": float("nan"), "profit_factor": None},
+        {"agent_id": "f", "sharpe": 0.5, "profit_factor": None},
+    ]
+
+    ranked = [row["agent_id"] for row in _rank_rows(rows)]
+
+    assert ranked == ["c", "a", "d", "f", "b", "e"]
+    assert _rank_rows([]) == []
+
+
+def test_nightly_eval_writes_missing_metrics_as_null(monkeypatch, tmp_path):
+    import json
+
+    from tal.evaluation import leaderboard
+
+    rows = [
+        {"agent_id": "a", "sharpe": 1.0, "profit_factor": float("nan")},
+        {"agent_id": "b", "sharpe": float("nan"), "profit_factor": None},
+    ]
+    monkeypatch.setattr(leaderboard, "summarize", lambda db, since_days, group: rows)
+
+    nightly_eval(
+        f"sqlite:///{(tmp_path / 'lab.db').as_posix()}",
+        str(tmp_path / "league"),
+        since_days=30,
+        top_k=1,
+        retire_k=1,
+    )
+
+    def reject_constant(name):
+        raise ValueError(f"non-standard JSON constant {name}")
+
+    text = (tmp_path / "league/allocations.json").read_text()
+    out = json.loads(text, parse_constant=reject_constant)
+    assert out["promote"] == ["a"] and out["retire"] == ["b"]
+    assert out["rows"][0]["profit_factor"] is None
+    assert out["rows"][1]["sharpe"] is None
@@ -22,3 +22,51 @@ def test_live_once_sim(tmp_path):
     out = json.loads(result.stdout)
     assert out["symbol"] == "SPY"
     assert (tmp_path / "artifacts/live/trades.csv").exists()
+
+
+def test_live_cfg_reuses_validated_settings():
+    from tal.live.wrapper import _live_cfg, _validated_live_cfg
+
+    _validated_live_cfg.cache_clear()
+    first = _live_cfg({"broker": "sim", "cash": "5000", "ledger_dir": "x"})
+    second = _live_cfg({"ledger_dir": "x", "cash": "5000", "broker": "sim"})
+
+    assert _validated_live_cfg.cache_info().hits == 1
+    assert first == second and first is not second
+    assert first.adapter == "sim" and first.cash == 5000.0
+    first.cash = 1.0  # each caller owns its copy
+    assert _live_cfg({"broker": "sim", "cash": "5000", "ledger_dir": "x"}).cash == 5000.0
+    _live_cfg({"paper": 1})
+    _live_cfg({"paper": True})
+    assert _validated_live_cfg.cache_info().misses == 3
+    assert _live_cfg({"symbols": ["SPY"]}).model_extra == {"symbols": ["SPY"]}
+
+
+def test_sim_market_data_history_pads_and_slices():
+    from tal.live.adapters import SimMarketData
+
+    md = SimMarketData({"SPY": [1.0, 2.0, 3.0]})
+
+    assert md.history("SPY", 5)["Close"].tolist() == [3.0, 3.0, 1.0, 2.0, 3.0]
+    tail = md.history("SPY", 2)
+    assert tail["Close"].tolist() == [2.0, 3.0]
+    assert list(tail.index) == [1, 2]
+    assert md.latest_price("SPY") == 3.0
+    assert md.latest_price("QQQ") == 100.0
+
+
+def test_live_once_blanks_unknown_placeholders_in_agent_yaml(monkeypatch, tmp_path):
+    from tal.live import wrapper
+
+    txt = Path("config/agents/codex_seed.yaml").read_text()
+    cfg = tmp_path / "agent.yaml"
+    cfg.write_text(txt.replace("id: codex_seed", "id: codex_seed${TAL_TEST_UNSET_PLACEHOLDER}"))
+    monkeypatch.delenv("TAL_TEST_UNSET_PLACEHOLDER", raising=False)
+    seen = {}
+    monkeypatch.setattr(wrapper, "run_live_once", lambda engine_cfg: seen.update(engine_cfg) or {})
+
+    result = CliRunner().invoke(app, ["live", "--config", str(cfg)])
+
+    assert result.exit_code == 0, result.stderr
+    # Same as load_agent_config: unknown ${VAR} placeholders expand to "".
+    assert seen["agent_id"] == "codex_seed"
@@ -22,3 +22,41 @@ def test_max_drawdown():
     dd = max_drawdown(eq)
     assert dd <= 0.0
     assert dd <= -0.1  # at least -10%
+
+
+def test_compute_kpis_matches_pandas_reference():
+    from tal.evaluation.metrics import TRADING_DAYS, compute_kpis
+
+    rng = np.random.default_rng(7)
+    r = pd.Series(rng.normal(0.0005, 0.01, 500))
+    r.iloc[[3, 10]] = 0.0
+    eq = (1.0 + r).cumprod()
+
+    kpis = compute_kpis(r, eq)
+
+    assert np.isclose(kpis["pnl"], eq.iloc[-1] - 1.0)
+    assert np.isclose(kpis["profit_factor"], r.clip(lower=0).sum() / -r.clip(upper=0).sum())
+    assert np.isclose(kpis["sharpe"], r.mean() / r.std(ddof=0) * np.sqrt(TRADING_DAYS))
+    assert np.isclose(kpis["max_dd"], (eq / eq.cummax() - 1.0).min())
+    assert np.isclose(kpis["win_rate"], (r > 0).sum() / ((r > 0).sum() + (r < 0).sum()))
+
+
+def test_kpi_loop_matches_numpy_helpers(monkeypatch):
+    from tal.evaluation import metrics
+
+    rng = np.random.default_rng(11)
+    r = pd.Series(rng.normal(0.0, 0.01, 300))
+    r.iloc[[5, 42]] = np.nan
+    eq = (1.0 + r.fillna(0.0)).cumprod()
+    monkeypatch.setattr(metrics, "_kpi_kernel", None)
+    expected = metrics.compute_kpis(r, eq)
+
+    pf, sharpe, max_dd, win = metrics._kpi_loop(
+        r.to_numpy(dtype=np.float64), eq.to_numpy(dtype=np.float64)
+    )
+
+    assert np.isclose(pf, expected["profit_factor"])
+    assert np.isclose(sharpe, expected["sharpe"])
+    assert np.isclose(max_dd, expected["max_dd"])
+    assert np.isclose(win, expected["win_rate"])
+    assert metrics._kpi_loop(np.empty(0), np.empty(0)) == (0.0, 0.0, 0.0, 0.0)
@@ -17,7 +17,7 @@ def test_persist_and_eval(monkeypatch, tmp_path):
     cfg_out.write_text(cfg_in)
 
     # mock yfinance to be offline/deterministic
-    def fake_download(symbol, period="max", interval="1d", auto_adjust=True):
+    def fake_download(symbol, **kwargs):
         return make_price_df(n=80)
     monkeypatch.setattr(engine, "yf", types.SimpleNamespace(download=fake_download))
 
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+
+from tal.strategies import rsi_mean_rev
+from tal.strategies.rsi_mean_rev import RSIMeanReversion
+
+
+def test_rsi_signal_loop_matches_pandas_path(monkeypatch):
+    rng = np.random.default_rng(3)
+    close = pd.Series(100.0 + np.cumsum(rng.normal(0.0, 1.0, 300)))
+    close.iloc[[0, 1, 2]] = 100.0  # flat start: zero losses -> NaN RSI -> bfill
+    df = close.rename("Close").to_frame()
+    monkeypatch.setattr(rsi_mean_rev, "_rsi_signal_kernel", None)
+
+    strat = RSIMeanReversion(rsi_len=14, overbought=55)
+    expected = strat.generate_signals(df)
+    got = rsi_mean_rev._rsi_signal_loop(close.to_numpy(dtype=np.float64), 14, 55.0)
+
+    assert (expected == 1).any() and (expected == -1).any()
+    assert np.array_equal(got, expected.to_numpy())
+
+
+def test_rsi_loop_matches_pandas_on_flat_then_rising():
+    # Flat, a few losses, then a steady climb: the loss window drains back to zero
+    # and must hit replace(0, nan) -> bfill just like the pandas path.
+    close = pd.Series(
+        [100.0] * 20 + [99.7, 99.1, 98.3, 98.9] + [98.9 + 0.1 * i for i in range(1, 60)]
+    )
+    expected = rsi_mean_rev._rsi(close, 14)
+    got = rsi_mean_rev._rsi_loop(close.to_numpy(dtype=np.float64), 14)
+
+    np.testing.assert_allclose(got, expected.to_numpy(), rtol=1e-9, atol=1e-9)
+    assert got[-1] == 50.0  # loss-free tail: undefined RSI falls back to 50
+
+
+def test_rolling_mean_loop_matches_pandas_rolling_mean():
+    rng = np.random.default_rng(11)
+    values = np.abs(rng.normal(0.0, 1.0, 200)) * 1e-3
+    values[40:80] = 0.0
+    values[[5, 90]] = np.nan
+    got = rsi_mean_rev._rolling_mean_loop(values, 14)
+    expected = pd.Series(values).rolling(14).mean().to_numpy()
+
+    np.testing.assert_allclose(got, expected, rtol=1e-9, atol=1e-12)
+    assert np.isnan(rsi_mean_rev._rolling_mean_loop(values[:5], 14)).all()
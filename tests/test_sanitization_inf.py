@@ -16,7 +16,7 @@ def test_profit_factor_infinite_is_sanitized(monkeypatch, tmp_path):
     cfg_out.write_text(cfg_in)
 
     # strictly up-only prices → PF=inf
-    def fake_download(symbol, period="max", interval="1d", auto_adjust=True):
+    def fake_download(symbol, **kwargs):
         return make_price_df(n=60, up_only=True)
     monkeypatch.setattr(engine, "yf", types.SimpleNamespace(download=fake_download))
 
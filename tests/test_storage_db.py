@@ -0,0 +1,118 @@
+from tal.storage.db import (
+    fetch_metric_sum_since,
+    fetch_metrics_for_runs,
+    fetch_metrics_since,
+    get_engine,
+    record_run,
+)
+
+
+def _run(run_id: str, ts_start: str) -> dict[str, str]:
+    return {
+        "id": run_id,
+        "agent_id": "a",
+        "mode": "backtest",
+        "ts_start": ts_start,
+        "ts_end": ts_start,
+        "commit_sha": "",
+        "config_hash": "",
+    }
+
+
+def test_fetch_metric_sum_since_filters_by_name_and_window(tmp_path):
+    engine = get_engine(f"sqlite:///{tmp_path / 'lab.db'}")
+    record_run(
+        engine,
+        _run("old", "2024-01-01T00:00:00+00:00"),
+        [{"run_id": "old", "name": "pnl", "value": 5.0}],
+    )
+    record_run(
+        engine,
+        _run("new", "2024-02-01T00:00:00+00:00"),
+        [
+            {"run_id": "new", "name": "pnl", "value": 0.25},
+            {"run_id": "new", "name": "sharpe", "value": 3.0},
+        ],
+    )
+    record_run(
+        engine,
+        _run("empty", "2024-02-02T00:00:00+00:00"),
+        [{"run_id": "empty", "name": "pnl", "value": None}],
+    )
+
+    assert fetch_metric_sum_since(engine, "2024-01-15T00:00:00+00:00", "pnl") == 0.25
+    assert fetch_metric_sum_since(engine, "2025-01-01T00:00:00+00:00", "pnl") == 0.0
+
+
+def test_fetch_metrics_since_joins_runs_in_one_query(tmp_path):
+    engine = get_engine(f"sqlite:///{tmp_path / 'lab.db'}")
+    record_run(
+        engine,
+        _run("old", "2024-01-01T00:00:00+00:00"),
+        [{"run_id": "old", "name": "sharpe", "value": 1.0}],
+    )
+    record_run(
+        engine,
+        _run("new", "2024-02-01T00:00:00+00:00"),
+        [
+            {"run_id": "new", "name": "pnl", "value": 0.25},
+            {"run_id": "new", "name": "sharpe", "value": 3.0},
+        ],
+    )
+
+    since = "2024-01-15T00:00:00+00:00"
+    rows = fetch_metrics_since(engine, since)
+    assert sorted((r["run_id"], r["name"]) for r in rows) == [("new", "pnl"), ("new", "sharpe")]
+    assert fetch_metrics_since(engine, since, ["sharpe"]) == [
+        {"run_id": "new", "name": "sharpe", "value": 3.0}
+    ]
+    assert fetch_metrics_since(engine, since, []) == []
+
+
+def test_get_engine_is_shared_per_url_and_recovers_from_deleted_file(tmp_path):
+    db_path = tmp_path / "lab.db"
+    url = f"sqlite:///{db_path}"
+    first = get_engine(url)
+    assert get_engine(url) is first
+
+    first.dispose()
+    db_path.unlink()
+    second = get_engine(url)
+    assert second is not first
+    assert fetch_metric_sum_since(second, "2024-01-01T00:00:00+00:00", "pnl") == 0.0
+
+
+def test_get_engine_pins_relative_sqlite_paths_to_cwd(tmp_path, monkeypatch):
+    first_dir = tmp_path / "one"
+    second_dir = tmp_path / "two"
+    first_dir.mkdir()
+    second_dir.mkdir()
+
+    monkeypatch.chdir(first_dir)
+    first = get_engine("sqlite:///./lab.db")
+    monkeypatch.chdir(second_dir)
+    second = get_engine("sqlite:///./lab.db")
+
+    assert second is not first
+    assert first.url.database == str((first_dir / "lab.db").resolve())
+    assert (first_dir / "lab.db").exists() and (second_dir / "lab.db").exists()
+    assert get_engine(f"sqlite:///{second_dir / 'lab.db'}") is second
+
+
+def test_fetch_metrics_for_runs_chunks_large_id_lists(tmp_path):
+    engine = get_engine(f"sqlite:///{tmp_path / 'lab.db'}")
+    record_run(
+        engine,
+        _run("r1", "2024-02-01T00:00:00+00:00"),
+        [{"run_id": "r1", "name": "pnl", "value": 1.0}],
+    )
+    record_run(
+        engine,
+        _run("r2", "2024-02-02T00:00:00+00:00"),
+        [{"run_id": "r2", "name": "pnl", "value": 2.0}],
+    )
+    run_ids = [f"missing-{i}" for i in range(2000)] + ["r1", "r2"]
+
+    rows = fetch_metrics_for_runs(engine, run_ids)
+
+    assert sorted((row["run_id"], row["value"]) for row in rows) == [("r1", 1.0), ("r2", 2.0)]
@@ -0,0 +1,25 @@
+import numpy as np
+import pytest
+
+from tal.storage import io
+
+
+@pytest.mark.parametrize("indent", [True, False])
+@pytest.mark.parametrize("sort_keys", [True, False])
+def test_dumps_json_fallback_matches_orjson(monkeypatch, indent, sort_keys):
+    if io.orjson is None:
+        pytest.skip("orjson not installed")
+    payload = {
+        "z": [1, 2.5, None, True, "café"],
+        "a": {"nan": float("nan"), "inf": float("-inf"), "np": np.float64(0.25)},
+        "arr": np.array([1.0, np.nan]),
+        "i": np.int64(7),
+        "empty": {},
+    }
+
+    fast = io.dumps_json(payload, indent=indent, sort_keys=sort_keys)
+    monkeypatch.setattr(io, "orjson", None)
+    slow = io.dumps_json(payload, indent=indent, sort_keys=sort_keys)
+
+    assert fast == slow
+    assert b"NaN" not in slow and "café".encode() in slow